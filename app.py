@@ -1,17 +1,84 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from werkzeug.serving import is_running_from_reloader
 from datetime import datetime
-from collections import Counter
+from collections import Counter, OrderedDict
+from functools import lru_cache, wraps
+from itertools import islice
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
 import json
+import hashlib
+import shutil
 import subprocess
 import uuid
 import re
-from sqlalchemy import or_, func, and_
+import threading
+import multiprocessing
+import time
+import heapq
+import mmap
+from sqlalchemy import or_, func, and_, case, event, select, table, column, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.pool import QueuePool
+from sbom_parser import (json_loads, load_sbom_json, collect_artifact_rows, process_sbom_file,
+                         extract_components_from_sbom, iter_sbom_components, get_component_licenses,
+                         get_component_supplier)
+
+# Prefer orjson for SBOM (de)serialization, fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Advisory file locks, so one process at a time runs the statistics refresher (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+def json_dumps(obj, sort_keys=False):
+    """Serialize obj to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding with orjson, so jsonify builds bytes directly"""
+    # Datetimes and dataclasses go through Flask's default hook to keep its output format
+    option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+              if orjson is not None else 0)
+    
+    def encode(self, obj, option=0):
+        option |= self.option | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        return orjson.dumps(obj, default=self.default, option=option)
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Pretty-print when the default provider would: compact set to False, or left unset in debug mode
+        option = 0
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option = orjson.OPT_INDENT_2
+        return self._app.response_class(self.encode(obj, option), mimetype=self.mimetype)
 
 # Initialize Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 # Enable CORS for all routes and origins
 CORS(app, resources={r"/*": {"origins": "*", "methods": ["GET", "POST", "OPTIONS"], "allow_headers": ["Content-Type", "Authorization"]}})
 
@@ -19,26 +86,92 @@ CORS(app, resources={r"/*": {"origins": "*", "methods": ["GET", "POST", "OPTIONS
 SBOM_DIR = "./sbom_files/"
 UPLOAD_DIR = "./uploads/"
 DATASET_DIR = "./sbom_files/SBOM/"
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB writes for uploaded files
+PLATFORM_PATTERNS = {
+    "Windows": '%windows%',
+    "Linux": '%linux%',
+    "macOS": '%mac%',
+    "Android": '%android%',
+    "iOS": '%ios%'
+}
+SEARCH_STREAM_MIN_BYTES = 64 * 1024 * 1024  # larger SBOMs are streamed by component search, not cached whole
+SEARCH_SCAN_CHUNK_SIZE = 4 * 1024 * 1024  # bytes lowercased at a time by the raw pre-scan of streamed SBOMs
+# Non-ASCII characters whose lowercase form is or contains an ASCII letter
+ASCII_LOWERCASE_LOOKALIKES = {'i': '\u0130', 'k': '\u212a'}
+FLOAT_REPR_CHARS = frozenset('0123456789.e+-')
+STREAM_BATCH_SIZE = 500  # rows fetched and encoded per chunk by the list endpoints
+HTTP_CACHE_MAX_AGE = 300  # seconds clients may reuse a cached SBOM response
+RESPONSE_CACHE_TTL = 300  # seconds; bounds staleness from SBOM files edited outside an upload
+RESPONSE_CACHE_MAX_ENTRIES = 256
+# Per parsed-SBOM cache, counted in file bytes; the parsed objects take several times that in memory
+SBOM_CACHE_MAX_BYTES = int(os.environ.get('SBOM_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+STATS_REFRESH_INTERVAL = int(os.environ.get('STATS_REFRESH_INTERVAL', 300))  # seconds
+STATS_POLL_INTERVAL = 5  # seconds between data version checks for writes made by other processes
+ARTIFACT_INDEX_POOL_MIN_FILES = 16  # below this, spawning worker processes costs more than it saves
 os.makedirs(SBOM_DIR, exist_ok=True)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(DATASET_DIR, exist_ok=True)
+# Uploads write into both SBOM directories; set their permissions once at startup
+try:
+    os.chmod(SBOM_DIR, 0o777)  # Full permissions
+    os.chmod(DATASET_DIR, 0o777)  # Full permissions
+except Exception as e:
+    print(f"Warning: Could not set permissions on directories: {e}")
+
+# Bodies of responses that never change, serialized once at import
+HOME_BODY = b"Welcome to SBOM Finder Backend!"
+STATIC_ERROR_BODIES = {
+    message: json_dumps({"error": message})
+    for message in (
+        "No file uploaded",
+        "No executable file uploaded",
+        "Keyword and SBOM filename required",
+        "SBOM not found",
+        "Two SBOM filenames are required",
+        "Invalid or missing field parameter",
+    )
+}
 
 # Database configuration
 SQLITE_PATH = os.environ.get('SQLITE_PATH', 'sboms.db')
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{SQLITE_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# One pooled connection per request thread (plus the stats refresher) so WAL readers run in
+# parallel without reopening the database file. Beyond that (the dev server's unbounded threads,
+# streamed responses held open by slow clients) SQLite connections are cheap to open, so a burst
+# gets temporary overflow connections instead of waiting out the pool timeout; -1 is unbounded
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', int(os.environ.get('GUNICORN_THREADS', 8)) + 1))
+DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', -1))
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'connect_args': {'check_same_thread': False},
+    'poolclass': QueuePool,
+    'pool_size': DB_POOL_SIZE,
+    'max_overflow': DB_POOL_MAX_OVERFLOW,
+}
 db = SQLAlchemy(app)
 
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so readers are not blocked by a concurrent writer, and tune each connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps the database consistent at NORMAL; only the last commits may be lost on power failure
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.close()
+
 # Enhanced SBOM Database Model
 class SBOM(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(120), unique=True, nullable=False)
     app_name = db.Column(db.String(100), nullable=False)
-    category = db.Column(db.String(50))
-    operating_system = db.Column(db.String(50))
-    app_binary_type = db.Column(db.String(50))  # mobile, desktop, web, etc.
-    supplier = db.Column(db.String(100))
-    manufacturer = db.Column(db.String(100))
+    category = db.Column(db.String(50), index=True)
+    operating_system = db.Column(db.String(50), index=True)
+    app_binary_type = db.Column(db.String(50), index=True)  # mobile, desktop, web, etc.
+    supplier = db.Column(db.String(100), index=True)
+    manufacturer = db.Column(db.String(100), index=True)
     version = db.Column(db.String(50))
     cost = db.Column(db.Float, default=0.0)
     total_components = db.Column(db.Integer, default=0)
@@ -46,56 +179,237 @@ class SBOM(db.Model):
     description = db.Column(db.Text)
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
 
+# Columns of an SBOM summary in response order, selected as plain rows instead of ORM objects
+SBOM_SUMMARY_COLUMNS = (
+    SBOM.id, SBOM.filename, SBOM.app_name, SBOM.category, SBOM.operating_system,
+    SBOM.supplier, SBOM.manufacturer, SBOM.version, SBOM.app_binary_type.label('binary_type'),
+)
+SBOM_COUNT_COLUMNS = (SBOM.total_components, SBOM.unique_licenses)
+
+# Comparison metadata columns, reported as "Unknown" for files without a database row
+SBOM_META_COLUMNS = (SBOM.category, SBOM.operating_system, SBOM.app_binary_type,
+                     SBOM.supplier, SBOM.manufacturer, SBOM.version)
+SBOM_META_DEFAULTS = {attr.key: "Unknown" for attr in SBOM_META_COLUMNS}
+
+# Expression indexes so case-insensitive prefix lookups (suggestions) can seek
+SUGGESTION_COLUMNS = (SBOM.app_name, SBOM.category, SBOM.operating_system,
+                      SBOM.supplier, SBOM.manufacturer, SBOM.app_binary_type)
+for _attr in SUGGESTION_COLUMNS:
+    db.Index(f'ix_sbom_{_attr.key}_lower', func.lower(_attr))
+
+# Components parsed out of each SBOM file, one row per component license
+class Artifact(db.Model):
+    __table_args__ = (
+        # Covers the per-SBOM license joins used by the statistics endpoints
+        db.Index('ix_artifact_sbom_license', 'sbom_id', 'license_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    sbom_id = db.Column(db.Integer, db.ForeignKey('sbom.id'), nullable=False, index=True)
+    name = db.Column(db.String(255))
+    version = db.Column(db.String(100))
+    license_id = db.Column(db.String(255), index=True)
+    supplier = db.Column(db.String(255), index=True)
+
+# File fingerprint (mtime, size) the Artifact rows of an SBOM were built from
+class ArtifactIndex(db.Model):
+    sbom_id = db.Column(db.Integer, db.ForeignKey('sbom.id'), primary_key=True)
+    file_mtime = db.Column(db.Float)
+    file_size = db.Column(db.Integer)
+
+# Counter bumped by triggers on every write to the sbom and artifact_index tables, from this
+# app or any other writer (import_sboms.py), identifying the data cached responses were built from
+class DataVersion(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# Precomputed unfiltered /api/statistics payload, refreshed in the background
+class StatsSnapshot(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    payload = db.Column(db.JSON, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Trigram full-text index over the SBOM text columns searched with '%value%';
+# trigram tables answer LIKE from the index, so substring semantics are unchanged
+SBOM_FTS_COLUMNS = ('app_name', 'filename', 'supplier', 'manufacturer')
+sbom_fts = table('sbom_fts', column('rowid'), *(column(name) for name in SBOM_FTS_COLUMNS))
+sbom_fts_enabled = False
+
+# Schema setup runs from the server entry points or the first request, never at import,
+# so processes that import this module for other reasons do not touch the database
+db_initialized = False
+db_init_lock = threading.Lock()
+
+stats_refresh_event = threading.Event()
+stats_refresh_thread = None
+stats_refresh_thread_lock = threading.Lock()
+
+# Rendered bodies of cacheable GET endpoints: URL -> (data version, expiry, body, etag)
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
+# Filename -> path of every SBOM file (SBOM_DIR shadowing DATASET_DIR), rescanned when
+# either directory's mtime changes; hits recheck the mtimes at most once per TTL
+SBOM_PATH_INDEX_TTL = 1.0  # seconds
+sbom_path_index = {}
+sbom_path_index_stamp = None
+sbom_path_index_checked = 0.0
+sbom_path_index_lock = threading.Lock()
+
+# Threads for reading SBOM files in parallel with the request thread
+sbom_load_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sbom-load')
+
+def init_db():
+    """Create any missing tables and indexes"""
+    db.create_all()
+    # create_all skips indexes added to tables that already exist
+    with db.engine.begin() as conn:
+        for model in (SBOM, Artifact):
+            for index in model.__table__.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+    init_data_version()
+    init_sbom_fts()
+
+def init_data_version():
+    """Create the data_version row and the triggers that bump it"""
+    with db.engine.begin() as conn:
+        conn.execute(text("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)"))
+        for table_name in (SBOM.__tablename__, ArtifactIndex.__tablename__):
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS data_version_{table_name}_{operation.lower()} "
+                    f"AFTER {operation} ON {table_name} BEGIN "
+                    f"UPDATE data_version SET version = version + 1 WHERE id = 1; END"))
+
+def init_sbom_fts():
+    """Create the sbom_fts table and its sync triggers, populating it on first use"""
+    global sbom_fts_enabled
+    columns = ', '.join(SBOM_FTS_COLUMNS)
+    new_values = ', '.join(f'new.{name}' for name in SBOM_FTS_COLUMNS)
+    old_values = ', '.join(f'old.{name}' for name in SBOM_FTS_COLUMNS)
+    try:
+        with db.engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sbom_fts'")).first()
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS sbom_fts USING fts5({columns}, "
+                f"content='sbom', content_rowid='id', tokenize='trigram')"))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS sbom_fts_ai AFTER INSERT ON sbom BEGIN "
+                f"INSERT INTO sbom_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS sbom_fts_ad AFTER DELETE ON sbom BEGIN "
+                f"INSERT INTO sbom_fts(sbom_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"))
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS sbom_fts_au AFTER UPDATE ON sbom BEGIN "
+                f"INSERT INTO sbom_fts(sbom_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO sbom_fts(rowid, {columns}) VALUES (new.id, {new_values}); END"))
+            if not exists:
+                conn.execute(text("INSERT INTO sbom_fts(sbom_fts) VALUES ('rebuild')"))
+        sbom_fts_enabled = True
+    except OperationalError as e:
+        # SQLite built without FTS5 or the trigram tokenizer (< 3.34)
+        print(f"Full-text index unavailable, using table scans for search: {e}")
+
+with app.app_context():
+    event.listen(db.engine, "connect", set_sqlite_pragmas)
+
+def ensure_db_initialized():
+    """Run init_db once per process (inherited across fork), before the first request rather than at import"""
+    global db_initialized
+    if db_initialized:
+        return
+    with db_init_lock:
+        if not db_initialized:
+            with app.app_context():
+                init_db()
+            db_initialized = True
+
+@app.before_request
+def initialize_before_request():
+    ensure_db_initialized()
+    # The refresher indexes artifacts and rebuilds the statistics snapshot, so it must run under
+    # any server; gunicorn and the dev server start it earlier, this covers everything else
+    start_stats_refresher()
+
+def sbom_data_version():
+    """Current data version; changes with every write to the sbom or artifact_index tables"""
+    return db.session.query(DataVersion.version).filter(DataVersion.id == 1).scalar()
+
+def cached_response(view):
+    """Cache a GET view's JSON body per URL until the data version changes or the TTL expires, with body ETags"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # The version comes from the database, so a write through any worker or script invalidates every cache
+        version = sbom_data_version()
+        key = request.full_path
+        now = time.monotonic()
+        with response_cache_lock:
+            entry = response_cache.get(key)
+        if entry and entry[0] == version and entry[1] > now:
+            body, etag = entry[2], entry[3]
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            with response_cache_lock:
+                response_cache[key] = (version, now + RESPONSE_CACHE_TTL, body, etag)
+                response_cache.move_to_end(key)
+                while len(response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+                    response_cache.popitem(last=False)
+        
+        # Matched only against a body that is current (within the TTL), so revalidating
+        # clients cannot keep a stale one alive by asking repeatedly
+        if request.if_none_match.contains(etag):
+            return not_modified(etag, max_age=0)
+        return with_etag(app.response_class(body, mimetype='application/json'), etag, max_age=0)
+    return wrapper
+
 # Home route
 @app.route('/')
 def home():
-    return "Welcome to SBOM Finder Backend!"
+    return app.response_class(HOME_BODY, mimetype='text/html')
 
 # List all SBOM filenames
 @app.route('/api/sboms', methods=['GET'])
 def list_sboms():
-    sboms = [s.filename for s in SBOM.query.all()]
-    return jsonify(sboms)
+    # The data version changes with any insert, delete or rename of an SBOM row
+    etag = f"sboms-{sbom_data_version()}"
+    if request.query_string:
+        etag += f"-{request.args.get('limit')}-{request.args.get('offset')}"
+    if request.if_none_match.contains(etag):
+        return not_modified(etag)
+    
+    query = paginate(db.session.query(SBOM.filename).order_by(SBOM.id))
+    sboms = (row[0] for row in query.yield_per(STREAM_BATCH_SIZE))
+    return with_etag(stream_json_list(sboms), etag)
 
 # Get metadata for all SBOMs
 @app.route('/api/sboms/metadata', methods=['GET'])
 def list_sboms_metadata():
-    sboms = SBOM.query.all()
-    result = []
-    for sbom in sboms:
-        result.append({
-            "id": sbom.id,
-            "filename": sbom.filename,
-            "app_name": sbom.app_name,
-            "category": sbom.category,
-            "operating_system": sbom.operating_system,
-            "supplier": sbom.supplier,
-            "manufacturer": sbom.manufacturer,
-            "version": sbom.version,
-            "binary_type": sbom.app_binary_type,
-            "upload_date": sbom.upload_date.isoformat() if sbom.upload_date else None,
-            "total_components": sbom.total_components,
-            "unique_licenses": sbom.unique_licenses
-        })
-    return jsonify(result)
+    query = db.session.query(*SBOM_SUMMARY_COLUMNS, SBOM.upload_date, *SBOM_COUNT_COLUMNS).order_by(SBOM.id)
+    
+    def result():
+        for row in paginate(query).yield_per(STREAM_BATCH_SIZE):
+            sbom = row._asdict()
+            if sbom["upload_date"]:
+                sbom["upload_date"] = sbom["upload_date"].isoformat()
+            yield sbom
+    return stream_json_list(result())
 
 # Get specific SBOM file contents
 @app.route('/api/sbom/<filename>', methods=['GET'])
 def get_sbom(filename):
-    # Check if file exists in SBOM_DIR
-    file_path = os.path.join(SBOM_DIR, filename)
-    if not os.path.exists(file_path):
-        # Try DATASET_DIR if not found in SBOM_DIR
-        file_path = os.path.join(DATASET_DIR, filename)
-        if not os.path.exists(file_path):
-            return jsonify({"error": "SBOM not found", "filename": filename}), 404
+    # Check SBOM_DIR, then DATASET_DIR
+    file_path = get_sbom_file_path(filename)
+    if file_path is None:
+        return jsonify({"error": "SBOM not found", "filename": filename}), 404
     
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
         # Get metadata from database
         sbom = SBOM.query.filter_by(filename=filename).first()
+        
         metadata = {}
         if sbom:
             metadata = {
@@ -121,12 +435,17 @@ def get_sbom(filename):
                 "binary_type": "Unknown"
             }
         
-        response = {
-            "metadata": metadata,
-            "sbom_data": data
-        }
+        # Skip parsing entirely when the client already has this version of both the file
+        # and its metadata (rows can be updated in place, e.g. by import_sboms.py)
+        stat = os.stat(file_path)
+        metadata_digest = hashlib.blake2b(json_dumps(metadata, sort_keys=True), digest_size=8).hexdigest()
+        etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{metadata_digest}"
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
         
-        return jsonify(response)
+        # The file is sent as-is, but must still be valid JSON to splice in
+        check_sbom_json(file_path, stat.st_mtime_ns)
+        return with_etag(stream_sbom_response(metadata, file_path), etag)
     except json.JSONDecodeError as e:
         return jsonify({"error": f"Invalid JSON in SBOM file: {str(e)}", "filename": filename}), 500
     except Exception as e:
@@ -137,7 +456,7 @@ def get_sbom(filename):
 def upload_sbom():
     file = request.files.get('file')
     if not file:
-        return jsonify({"error": "No file uploaded"}), 400
+        return static_error("No file uploaded", 400)
 
     metadata = request.form
     original_filename = file.filename
@@ -158,29 +477,17 @@ def upload_sbom():
     if SBOM.query.filter_by(filename=filename).first():
         return jsonify({"error": f"File with name {filename} already exists"}), 400
 
-    # Ensure directories exist with appropriate permissions
-    try:
-        # Create main SBOM directory
-        os.makedirs(SBOM_DIR, exist_ok=True)
-        os.chmod(SBOM_DIR, 0o777)  # Full permissions
-        
-        # Create dataset directory 
-        os.makedirs(DATASET_DIR, exist_ok=True)
-        os.chmod(DATASET_DIR, 0o777)  # Full permissions
-    except Exception as e:
-        print(f"Warning: Could not set permissions on directories: {e}")
-
     # Path to save in main SBOM directory
     sbom_dir_path = os.path.join(SBOM_DIR, filename)
     
     # Save to SBOM_DIR
     try:
-        file.save(sbom_dir_path)
+        save_upload(file, sbom_dir_path)
     except Exception as e:
         return jsonify({"error": f"Could not save file to main directory: {str(e)}"}), 500
 
     # Process SBOM to count components and licenses
-    components, unique_licenses = process_sbom_file(sbom_dir_path)
+    components, unique_licenses, artifact_rows = process_sbom_file(sbom_dir_path)
 
     # Add to database
     new_sbom = SBOM(
@@ -199,16 +506,17 @@ def upload_sbom():
     )
 
     db.session.add(new_sbom)
+    db.session.flush()
+    store_artifact_rows(new_sbom, sbom_dir_path, artifact_rows)
+    invalidate_stats_snapshot()
     db.session.commit()
+    stats_refresh_event.set()
 
     # Now try to copy to dataset directory
     dataset_saved = False
-    dataset_dir_path = os.path.join(DATASET_DIR, filename)
     
     try:
-        # Directly copy the file instead of opening/writing
-        import shutil
-        shutil.copy2(sbom_dir_path, dataset_dir_path)
+        link_to_dataset(sbom_dir_path, filename)
         dataset_saved = True
     except Exception as e:
         print(f"Warning: Could not save to dataset directory: {e}")
@@ -227,36 +535,150 @@ def upload_sbom():
         "dataset_saved": dataset_saved
     }), 200
 
+# Upload several SBOMs sharing the same metadata in one database transaction
+@app.route('/api/upload/bulk', methods=['POST'])
+def upload_sboms_bulk():
+    files = [file for file in request.files.getlist('files') if file.filename]
+    if not files:
+        return static_error("No file uploaded", 400)
+
+    metadata = request.form
+    
+    # Skip names already in the database or SBOM_DIR, or repeated within this request
+    filenames = [os.path.basename(file.filename) for file in files]
+    existing = {row[0] for row in db.session.query(SBOM.filename).filter(SBOM.filename.in_(filenames))}
+    uploads = []
+    skipped = []
+    for file, filename in zip(files, filenames):
+        if not filename:
+            skipped.append({"filename": file.filename, "error": "Invalid file name"})
+            continue
+        if filename in existing or os.path.exists(os.path.join(SBOM_DIR, filename)):
+            skipped.append({"filename": filename, "error": f"File with name {filename} already exists"})
+            continue
+        existing.add(filename)
+        
+        # Saved under a temporary name and renamed only once the rows are committed,
+        # so a failed batch leaves no files behind and never overwrites another upload's
+        temp_path = os.path.join(SBOM_DIR, f".{filename}.{uuid.uuid4().hex}.part")
+        try:
+            save_upload(file, temp_path)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            skipped.append({"filename": filename, "error": f"Could not save file to main directory: {str(e)}"})
+            continue
+        uploads.append((filename, temp_path, process_sbom_file(temp_path)))
+    
+    if not uploads:
+        return jsonify({"message": "No SBOMs uploaded", "uploaded": [], "skipped": skipped}), 400
+
+    new_sboms = [
+        SBOM(
+            filename=filename,
+            app_name=os.path.splitext(filename)[0],
+            category=metadata.get('category'),
+            operating_system=metadata.get('operating_system'),
+            app_binary_type=metadata.get('app_binary_type', 'desktop'),
+            supplier=metadata.get('supplier'),
+            manufacturer=metadata.get('manufacturer'),
+            version=metadata.get('version'),
+            cost=float(metadata.get('cost') or 0),
+            description=metadata.get('description', ''),
+            total_components=components,
+            unique_licenses=unique_licenses
+        )
+        for filename, _, (components, unique_licenses, _) in uploads
+    ]
+    
+    # Take the write lock up front so the batch commits once, with a single fsync
+    committed = False
+    try:
+        db.session.execute(text("BEGIN IMMEDIATE"))
+        db.session.add_all(new_sboms)
+        db.session.flush()
+        # A rename keeps the mtime and size recorded here from the temporary file
+        for new_sbom, (_, temp_path, (_, _, artifact_rows)) in zip(new_sboms, uploads):
+            store_artifact_rows(new_sbom, temp_path, artifact_rows)
+        invalidate_stats_snapshot()
+        db.session.commit()
+        committed = True
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "One or more files were uploaded concurrently by another request"}), 400
+    finally:
+        if not committed:
+            for _, temp_path, _ in uploads:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+    stats_refresh_event.set()
+
+    uploaded = []
+    unplaced_ids = []
+    for new_sbom, (filename, temp_path, _) in zip(new_sboms, uploads):
+        sbom_dir_path = os.path.join(SBOM_DIR, filename)
+        try:
+            os.replace(temp_path, sbom_dir_path)
+        except OSError as e:
+            unplaced_ids.append(new_sbom.id)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            skipped.append({"filename": filename, "error": f"Could not save file to main directory: {str(e)}"})
+            continue
+        dataset_saved = False
+        try:
+            link_to_dataset(sbom_dir_path, filename)
+            dataset_saved = True
+        except Exception as e:
+            print(f"Warning: Could not save to dataset directory: {e}")
+        uploaded.append({"sbom_id": new_sbom.id, "filename": filename, "dataset_saved": dataset_saved})
+    
+    # Drop the rows of files that could not be moved into place, so no row points at a missing file
+    if unplaced_ids:
+        Artifact.query.filter(Artifact.sbom_id.in_(unplaced_ids)).delete(synchronize_session=False)
+        ArtifactIndex.query.filter(ArtifactIndex.sbom_id.in_(unplaced_ids)).delete(synchronize_session=False)
+        SBOM.query.filter(SBOM.id.in_(unplaced_ids)).delete(synchronize_session=False)
+        invalidate_stats_snapshot()
+        db.session.commit()
+        stats_refresh_event.set()
+
+    return jsonify({
+        "message": f"{len(uploaded)} SBOMs uploaded successfully with metadata",
+        "uploaded": uploaded,
+        "skipped": skipped
+    }), 200
+
 # Auto-generate SBOM from uploaded executable using Syft
 @app.route('/api/generate-sbom', methods=['POST'])
 def generate_sbom():
     file = request.files.get('file')
     if not file:
-        return jsonify({"error": "No executable file uploaded"}), 400
+        return static_error("No executable file uploaded", 400)
 
     original_name = file.filename
     ext = os.path.splitext(original_name)[1]
     unique_name = f"{uuid.uuid4().hex}{ext}"
     exe_path = os.path.join(UPLOAD_DIR, unique_name)
 
-    file.save(exe_path)
+    # Only read by syft and deleted afterwards, so it need not survive a crash
+    save_upload(file, exe_path, fsync=False)
 
     # Generate SBOM using Syft
     sbom_filename = f"{os.path.splitext(original_name)[0]}_sbom.json"
     sbom_path = os.path.join(SBOM_DIR, sbom_filename)
 
     try:
-        result = subprocess.run(
-            ["syft", exe_path, "-o", "cyclonedx-json", "-q"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        with open(sbom_path, 'w') as f:
-            f.write(result.stdout)
+        # Let Syft write straight into the SBOM file instead of buffering stdout
+        with open(sbom_path, 'wb') as f:
+            subprocess.run(
+                ["syft", exe_path, "-o", "cyclonedx-json", "-q"],
+                stdout=f,
+                stderr=subprocess.PIPE,
+                check=True
+            )
 
         # Process SBOM for metadata
-        components, unique_licenses = process_sbom_file(sbom_path)
+        components, unique_licenses, artifact_rows = process_sbom_file(sbom_path)
 
         # Save in DB
         new_sbom = SBOM(
@@ -274,7 +696,11 @@ def generate_sbom():
             unique_licenses=unique_licenses
         )
         db.session.add(new_sbom)
+        db.session.flush()
+        store_artifact_rows(new_sbom, sbom_path, artifact_rows)
+        invalidate_stats_snapshot()
         db.session.commit()
+        stats_refresh_event.set()
 
         return jsonify({
             "message": f"SBOM generated successfully for {original_name}", 
@@ -283,7 +709,9 @@ def generate_sbom():
         }), 200
 
     except subprocess.CalledProcessError as e:
-        return jsonify({"error": f"Syft error: {e.stderr}"}), 500
+        if os.path.exists(sbom_path):
+            os.remove(sbom_path)
+        return jsonify({"error": f"Syft error: {e.stderr.decode('utf-8', errors='replace')}"}), 500
     except Exception as e:
         return jsonify({"error": f"Error: {str(e)}"}), 500
     finally:
@@ -298,28 +726,26 @@ def search_components():
     filename = data.get('sbom_file')
 
     if not keyword or not filename:
-        return jsonify({"error": "Keyword and SBOM filename required"}), 400
+        return static_error("Keyword and SBOM filename required", 400)
 
-    # Check if file exists in SBOM_DIR
-    file_path = os.path.join(SBOM_DIR, filename)
-    if not os.path.exists(file_path):
-        # Try DATASET_DIR if not found in SBOM_DIR
-        file_path = os.path.join(DATASET_DIR, filename)
-        if not os.path.exists(file_path):
-            return jsonify({"error": "SBOM not found"}), 404
-
-    with open(file_path, 'r') as f:
-        sbom_data = json.load(f)
+    # Check SBOM_DIR, then DATASET_DIR
+    file_path = get_sbom_file_path(filename)
+    if file_path is None:
+        return static_error("SBOM not found", 404)
 
-    # Extract components based on SBOM format
-    components = extract_components_from_sbom(sbom_data)
-    
-    # Search for keyword in components
-    results = []
+    # Search for keyword in components; very large files are walked one component at a time,
+    # others are matched against a cached lowercase text index of the file. The keyword is
+    # matched within each key and scalar (true/false/null as JSON literals), not across JSON
+    # punctuation, so fragments like '"name": "x"' do not match
     keyword_lower = keyword.lower()
-    for component in components:
-        if keyword_lower in json.dumps(component).lower():
-            results.append(component)
+    if os.path.getsize(file_path) >= SEARCH_STREAM_MIN_BYTES or "\0" in keyword_lower:
+        contains = json_contains  # local lookup in the hot loop
+        if sbom_may_contain(file_path, keyword_lower):
+            results = [component for component in iter_sbom_components(file_path) if contains(component, keyword_lower)]
+        else:
+            results = []
+    else:
+        results = find_components(file_path, keyword_lower)
 
     return jsonify({
         "filename": filename,
@@ -335,58 +761,73 @@ def compare_sboms():
     sbom2 = data.get('sbom2')
 
     if not sbom1 or not sbom2:
-        return jsonify({"error": "Two SBOM filenames are required"}), 400
+        return static_error("Two SBOM filenames are required", 400)
+
+    sbom1_path = get_sbom_file_path(sbom1)
+    sbom2_path = get_sbom_file_path(sbom2)
+
+    # Comparing an SBOM with itself (the same file, or a hard link to it) needs only one parse;
+    # a stat per side is all this costs, unlike reading both files to compare their bytes
+    identical = (sbom1_path is not None and sbom2_path is not None
+                 and same_file(sbom1_path, sbom2_path))
+
+    # Read and index the two files concurrently: the first on the loader pool,
+    # the second on this thread; unchanged files come straight from the cache
+    sbom1_future = sbom_load_executor.submit(load_compare_index_or_none, sbom1_path)
+    sbom2_index = None if identical else load_compare_index_or_none(sbom2_path)
+    sbom1_index = sbom1_future.result()
 
     # Process first SBOM
-    sbom1_data, sbom1_meta = get_sbom_data_and_meta(sbom1)
-    if not sbom1_data:
+    if not sbom1_index:
         return jsonify({"error": f"SBOM {sbom1} not found"}), 404
+    sbom1_meta = get_sbom_meta(sbom1)
 
     # Process second SBOM
-    sbom2_data, sbom2_meta = get_sbom_data_and_meta(sbom2)
-    if not sbom2_data:
+    if identical:
+        sbom2_index = sbom1_index
+    elif not sbom2_index:
         return jsonify({"error": f"SBOM {sbom2} not found"}), 404
+    sbom2_meta = get_sbom_meta(sbom2)
 
-    # Extract components
-    components1 = extract_components_from_sbom(sbom1_data)
-    components2 = extract_components_from_sbom(sbom2_data)
-
-    # Create component maps for efficient comparison
-    comp_map1 = {get_component_key(comp): comp for comp in components1}
-    comp_map2 = {get_component_key(comp): comp for comp in components2}
+    # Components, their comparison keys, key -> component maps and license distributions
+    components1, keys1, comp_map1, licenses1 = sbom1_index
+    components2, keys2, comp_map2, licenses2 = sbom2_index
+    
+    # Same components in the same order (e.g. rebuilds of one app) need no set
+    # operations; key views support them directly otherwise. Only the returned
+    # components (limited to 100 for performance) are materialized
+    if identical or keys1 == keys2:
+        common_keys, only_in_first_keys, only_in_second_keys = comp_map1.keys(), (), ()
+    else:
+        common_keys = comp_map1.keys() & comp_map2.keys()
+        only_in_first_keys = comp_map1.keys() - comp_map2.keys()
+        only_in_second_keys = comp_map2.keys() - comp_map1.keys()
     
     # Find components in both SBOMs
-    common_keys = set(comp_map1.keys()) & set(comp_map2.keys())
-    common_components = [comp_map1[key] for key in common_keys]
+    common_components = [comp_map1[key] for key in islice(common_keys, 100)]
     
     # Find components only in first SBOM
-    only_in_first_keys = set(comp_map1.keys()) - set(comp_map2.keys())
-    only_in_first = [comp_map1[key] for key in only_in_first_keys]
+    only_in_first = [comp_map1[key] for key in islice(only_in_first_keys, 100)]
     
     # Find components only in second SBOM
-    only_in_second_keys = set(comp_map2.keys()) - set(comp_map1.keys())
-    only_in_second = [comp_map2[key] for key in only_in_second_keys]
-    
-    # Calculate license distribution
-    licenses1 = count_licenses(components1)
-    licenses2 = count_licenses(components2)
+    only_in_second = [comp_map2[key] for key in islice(only_in_second_keys, 100)]
     
     comparison_stats = {
-        "common_component_count": len(common_components),
-        "only_in_first_count": len(only_in_first),
-        "only_in_second_count": len(only_in_second),
+        "common_component_count": len(common_keys),
+        "only_in_first_count": len(only_in_first_keys),
+        "only_in_second_count": len(only_in_second_keys),
         "first_total_components": len(components1),
         "second_total_components": len(components2),
-        "similarity_percentage": round(len(common_components) / (len(components1) + len(components2) - len(common_components)) * 100, 2) if components1 and components2 else 0
+        "similarity_percentage": round(len(common_keys) / (len(components1) + len(components2) - len(common_keys)) * 100, 2) if components1 and components2 else 0
     }
 
     return jsonify({
         "sbom1_meta": sbom1_meta,
         "sbom2_meta": sbom2_meta,
         "comparison_stats": comparison_stats,
-        "common_components": common_components[:100],  # Limit to 100 for performance
-        "only_in_first": only_in_first[:100],
-        "only_in_second": only_in_second[:100],
+        "common_components": common_components,
+        "only_in_first": only_in_first,
+        "only_in_second": only_in_second,
         "sbom1_licenses": licenses1,
         "sbom2_licenses": licenses2
     })
@@ -403,13 +844,13 @@ def search_sboms():
     manufacturer = request.args.get('manufacturer', '')
     
     # Build query
-    query = SBOM.query
+    query = db.session.query(*SBOM_SUMMARY_COLUMNS, *SBOM_COUNT_COLUMNS)
     
     # Apply filters
     if name:
         query = query.filter(or_(
-            SBOM.app_name.ilike(f'%{name}%'),
-            SBOM.filename.ilike(f'%{name}%')
+            contains_filter(SBOM.app_name, name),
+            contains_filter(SBOM.filename, name)
         ))
     
     if category:
@@ -422,38 +863,22 @@ def search_sboms():
         query = query.filter(SBOM.app_binary_type.ilike(f'%{binary_type}%'))
     
     if supplier:
-        query = query.filter(SBOM.supplier.ilike(f'%{supplier}%'))
+        query = query.filter(contains_filter(SBOM.supplier, supplier))
     
     if manufacturer:
-        query = query.filter(SBOM.manufacturer.ilike(f'%{manufacturer}%'))
-    
-    # Execute query
-    sboms = query.all()
-    
-    # Format results
-    results = []
-    for sbom in sboms:
-        results.append({
-            "id": sbom.id,
-            "filename": sbom.filename,
-            "app_name": sbom.app_name,
-            "category": sbom.category,
-            "operating_system": sbom.operating_system,
-            "supplier": sbom.supplier,
-            "manufacturer": sbom.manufacturer,
-            "version": sbom.version,
-            "binary_type": sbom.app_binary_type,
-            "total_components": sbom.total_components,
-            "unique_licenses": sbom.unique_licenses
-        })
+        query = query.filter(contains_filter(SBOM.manufacturer, manufacturer))
+    
+    # Execute query; count is the total number of matches, even when paginated
+    count = query.count()
+    sboms = paginate(query.order_by(SBOM.id)).yield_per(STREAM_BATCH_SIZE)
+    
+    results = (row._asdict() for row in sboms)
 
-    return jsonify({
-        "count": len(results),
-        "results": results
-    })
+    return stream_json_list(results, prefix=b'{"count":' + json_dumps(count) + b',"results":', suffix=b'}')
 
 # Get statistical information about SBOMs
 @app.route('/api/statistics', methods=['GET'])
+@cached_response
 def sbom_statistics():
     # Get filter parameters
     category = request.args.get('category')
@@ -462,132 +887,56 @@ def sbom_statistics():
     manufacturer = request.args.get('manufacturer')
     binary_type = request.args.get('binary_type')
     
-    # Build query with filters
-    query = SBOM.query
+    # Build filters
+    filters = []
     
     if category:
-        query = query.filter(SBOM.category.ilike(f'%{category}%'))
+        filters.append(SBOM.category.ilike(f'%{category}%'))
     
     if operating_system:
-        query = query.filter(SBOM.operating_system.ilike(f'%{operating_system}%'))
+        filters.append(SBOM.operating_system.ilike(f'%{operating_system}%'))
     
     if supplier:
-        query = query.filter(SBOM.supplier.ilike(f'%{supplier}%'))
+        filters.append(contains_filter(SBOM.supplier, supplier))
     
     if manufacturer:
-        query = query.filter(SBOM.manufacturer.ilike(f'%{manufacturer}%'))
+        filters.append(contains_filter(SBOM.manufacturer, manufacturer))
     
     if binary_type:
-        query = query.filter(SBOM.app_binary_type.ilike(f'%{binary_type}%'))
-    
-    # Execute query
-    sboms = query.all()
+        filters.append(SBOM.app_binary_type.ilike(f'%{binary_type}%'))
     
-    stats = {
-        "total_sboms": len(sboms),
-        "total_components": sum(sbom.total_components for sbom in sboms),
-        "average_components_per_sbom": round(sum(sbom.total_components for sbom in sboms) / len(sboms), 2) if sboms else 0,
-        "average_unique_licenses": round(sum(sbom.unique_licenses for sbom in sboms) / len(sboms), 2) if sboms else 0
-    }
+    # Unfiltered statistics are served from the background snapshot
+    if not filters:
+        snapshot = db.session.get(StatsSnapshot, 1)
+        if snapshot:
+            return jsonify(snapshot.payload)
     
-    # Collect additional statistics
-    os_counter = Counter()
-    category_counter = Counter()
-    binary_type_counter = Counter()
-    supplier_counter = Counter()
-    manufacturer_counter = Counter()
-    license_counter = Counter()
-
-    # Process each SBOM
-    for sbom in sboms:
-        os_name = sbom.operating_system or "Unknown"
-        os_counter[os_name] += 1
-
-        cat = sbom.category or "Unknown"
-        category_counter[cat] += 1
-        
-        bin_type = sbom.app_binary_type or "Unknown"
-        binary_type_counter[bin_type] += 1
-        
-        sup = sbom.supplier or "Unknown"
-        supplier_counter[sup] += 1
-        
-        manu = sbom.manufacturer or "Unknown"
-        manufacturer_counter[manu] += 1
-        
-        # Get license information from file
-        try:
-            file_path = get_sbom_file_path(sbom.filename)
-            if file_path:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                components = extract_components_from_sbom(data)
-                
-                for component in components:
-                    for license_info in get_component_licenses(component):
-                        license_counter[license_info] += 1
-        except Exception as e:
-            print(f"Error getting license info for {sbom.filename}: {e}")
-    
-    # Add distribution data to statistics
-    stats["os_distribution"] = dict(os_counter.most_common())
-    stats["category_distribution"] = dict(category_counter.most_common())
-    stats["binary_type_distribution"] = dict(binary_type_counter.most_common())
-    stats["supplier_distribution"] = dict(supplier_counter.most_common(10))
-    stats["manufacturer_distribution"] = dict(manufacturer_counter.most_common(10))
-    stats["license_distribution"] = dict(license_counter.most_common(10))
-
-    return jsonify(stats)
+    return jsonify(compute_statistics(filters))
 
 # Get platform-specific statistics
 @app.route('/api/platform-stats', methods=['GET'])
+@cached_response
 def platform_statistics():
-    platforms = {
-        "Windows": SBOM.query.filter(SBOM.operating_system.ilike('%windows%')).all(),
-        "Linux": SBOM.query.filter(SBOM.operating_system.ilike('%linux%')).all(),
-        "macOS": SBOM.query.filter(SBOM.operating_system.ilike('%mac%')).all(),
-        "Android": SBOM.query.filter(SBOM.operating_system.ilike('%android%')).all(),
-        "iOS": SBOM.query.filter(SBOM.operating_system.ilike('%ios%')).all()
-    }
+    binary_types = platform_binary_types()
+    top_licenses = platform_top_licenses(5)
     
     results = {}
     
-    for platform_name, sboms in platforms.items():
-        if not sboms:
+    for platform_name, groups in binary_types.items():
+        if not groups:
             results[platform_name] = {"count": 0}
             continue
         
+        count = sum(group_count for _, group_count, _ in groups)
+        total_components = sum(group_components for _, _, group_components in groups)
         platform_stats = {
-            "count": len(sboms),
-            "total_components": sum(sbom.total_components for sbom in sboms),
-            "average_components": round(sum(sbom.total_components for sbom in sboms) / len(sboms), 2),
-            "binary_types": {}
+            "count": count,
+            "total_components": total_components,
+            "average_components": round(total_components / count, 2),
+            "binary_types": {binary_type: group_count for binary_type, group_count, _ in groups}
         }
         
-        # Count binary types
-        binary_counter = Counter()
-        for sbom in sboms:
-            binary_counter[sbom.app_binary_type or "Unknown"] += 1
-        
-        platform_stats["binary_types"] = dict(binary_counter.most_common())
-        
-        # Count most common licenses
-        license_counter = Counter()
-        for sbom in sboms:
-            try:
-                file_path = get_sbom_file_path(sbom.filename)
-                if file_path:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)
-                    components = extract_components_from_sbom(data)
-                    
-                    for component in components:
-                        for license_info in get_component_licenses(component):
-                            license_counter[license_info] += 1
-            except Exception as e:
-                print(f"Error getting license info: {e}")
-        
-        platform_stats["top_licenses"] = dict(license_counter.most_common(5))
+        platform_stats["top_licenses"] = top_licenses[platform_name]
         results[platform_name] = platform_stats
     
     return jsonify(results)
@@ -595,40 +944,46 @@ def platform_statistics():
 # Diagnostic endpoint for listing all SBOMs with file existence check
 @app.route('/api/diagnostics/sboms', methods=['GET'])
 def diagnostic_sboms():
-    sboms = SBOM.query.all()
-    results = []
-    
-    for sbom in sboms:
-        # Check if file exists
-        sbom_file = sbom.filename
-        file_in_sbom_dir = os.path.exists(os.path.join(SBOM_DIR, sbom_file))
-        file_in_dataset_dir = os.path.exists(os.path.join(DATASET_DIR, sbom_file))
-        
-        results.append({
-            "id": sbom.id,
-            "filename": sbom.filename,
-            "app_name": sbom.app_name,
-            "operating_system": sbom.operating_system,
-            "category": sbom.category,
-            "file_exists_in_sbom_dir": file_in_sbom_dir,
-            "file_exists_in_dataset_dir": file_in_dataset_dir,
-            "file_exists": file_in_sbom_dir or file_in_dataset_dir
-        })
+    query = (db.session.query(SBOM.id, SBOM.filename, SBOM.app_name, SBOM.operating_system, SBOM.category)
+             .order_by(SBOM.id))
+    # count is the total number of SBOMs, even when paginated
+    count = query.order_by(None).count()
+    sboms = paginate(query).yield_per(STREAM_BATCH_SIZE)
     
-    return jsonify({
-        "count": len(results),
-        "sboms": results
-    })
+    # One directory listing each instead of two exists() calls per SBOM
+    sbom_dir_files = list_dir_files(SBOM_DIR)
+    dataset_dir_files = list_dir_files(DATASET_DIR)
+    
+    def results():
+        for sbom in sboms:
+            # Check if file exists
+            sbom_file = sbom.filename
+            file_in_sbom_dir = sbom_file in sbom_dir_files
+            file_in_dataset_dir = sbom_file in dataset_dir_files
+            
+            yield {
+                "id": sbom.id,
+                "filename": sbom.filename,
+                "app_name": sbom.app_name,
+                "operating_system": sbom.operating_system,
+                "category": sbom.category,
+                "file_exists_in_sbom_dir": file_in_sbom_dir,
+                "file_exists_in_dataset_dir": file_in_dataset_dir,
+                "file_exists": file_in_sbom_dir or file_in_dataset_dir
+            }
+    
+    return stream_json_list(results(), prefix=b'{"count":' + json_dumps(count) + b',"sboms":', suffix=b'}')
 
 # Get autocomplete suggestions for search fields
 @app.route('/api/suggestions', methods=['GET'])
+@cached_response
 def get_suggestions():
     field = request.args.get('field')
     prefix = request.args.get('prefix', '')
     
     if not field or field not in ['app_name', 'category', 'operating_system', 
                                  'supplier', 'manufacturer', 'app_binary_type']:
-        return jsonify({"error": "Invalid or missing field parameter"}), 400
+        return static_error("Invalid or missing field parameter", 400)
     
     # Map field names to model attributes
     field_map = {
@@ -642,10 +997,13 @@ def get_suggestions():
     
     # Build and execute query
     attr = field_map[field]
-    query = db.session.query(attr).distinct()
+    query = db.session.query(attr)
     
     if prefix:
-        query = query.filter(attr.ilike(f'{prefix}%'))
+        query = query.filter(prefix_filter(attr, prefix))
+    
+    # Distinct values in order of first appearance
+    query = query.group_by(attr).order_by(func.min(SBOM.id))
     
     # Get results
     values = [r[0] for r in query.all() if r[0] is not None and r[0] != '']
@@ -653,40 +1011,299 @@ def get_suggestions():
     return jsonify({"suggestions": values})
 
 # Helper functions
-def process_sbom_file(file_path):
-    """Process SBOM file to count components and unique licenses"""
+def contains_filter(attr, value):
+    """Case-insensitive substring filter, answered from sbom_fts where the column is indexed"""
+    pattern = f'%{value}%'
+    # Trigram lookups need at least three characters to use the index
+    if not sbom_fts_enabled or attr.key not in SBOM_FTS_COLUMNS or len(value) < 3:
+        return attr.ilike(pattern)
+    return SBOM.id.in_(select(sbom_fts.c.rowid).where(sbom_fts.c[attr.key].like(pattern)))
+
+def prefix_filter(attr, prefix):
+    """Case-insensitive prefix filter, written as a range on lower(attr) so its index is used"""
+    # SQLite's lower() and LIKE only fold ASCII, so fold the prefix the same way
+    lowered = ''.join(ch.lower() if ch.isascii() else ch for ch in prefix)
+    if '%' in prefix or '_' in prefix or lowered[-1] == '\U0010ffff':
+        # Keep LIKE wildcard semantics for prefixes that contain them
+        return attr.ilike(f'{prefix}%')
+    upper_bound = lowered[:-1] + chr(ord(lowered[-1]) + 1)
+    return and_(func.lower(attr) >= lowered, func.lower(attr) < upper_bound)
+
+def paginate(query):
+    """Apply the optional ?limit= and ?offset= request arguments to a query"""
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', type=int)
+    if offset:
+        query = query.offset(max(offset, 0))
+    if limit is not None:
+        query = query.limit(max(limit, 0))
+    return query
+
+def stream_json_list(items, prefix=b'', suffix=b''):
+    """Stream items as a JSON array, encoding a batch of them per chunk"""
+    def generate():
+        yield prefix + b'['
+        separator = b''
+        batch = []
+        for item in items:
+            batch.append(json_dumps(item, sort_keys=True))
+            if len(batch) >= STREAM_BATCH_SIZE:
+                yield separator + b','.join(batch)
+                separator = b','
+                batch = []
+        if batch:
+            yield separator + b','.join(batch)
+        yield b']' + suffix
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+def static_error(message, status):
+    """Build an error response from its pre-serialized body"""
+    return app.response_class(STATIC_ERROR_BODIES[message], status=status, mimetype='application/json')
+
+def with_etag(response, etag, max_age=HTTP_CACHE_MAX_AGE):
+    """Attach an ETag and a revalidation window to a response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'max-age={max_age}'
+    return response
+
+def not_modified(etag, max_age=HTTP_CACHE_MAX_AGE):
+    """Build an empty 304 response for a matching If-None-Match"""
+    return with_etag(app.response_class(status=304), etag, max_age)
+
+def list_dir_files(path):
+    """Names of the regular files directly inside a directory"""
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-        
-        components = extract_components_from_sbom(data)
-        unique_licenses = set()
-        
-        for component in components:
-            for license_info in get_component_licenses(component):
-                unique_licenses.add(license_info)
-        
-        return len(components), len(unique_licenses)
-    except Exception as e:
-        print(f"Error processing SBOM file {file_path}: {e}")
-        return 0, 0
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+def save_upload(file, file_path, fsync=True):
+    """Stream an uploaded file to disk using large unbuffered writes, by default fsynced once before it is recorded"""
+    with open(file_path, 'wb', buffering=0) as dst:
+        shutil.copyfileobj(file.stream, dst, length=UPLOAD_CHUNK_SIZE)
+        if fsync:
+            os.fsync(dst.fileno())
+
+def link_to_dataset(src_path, filename):
+    """Expose a saved SBOM in the dataset directory via a hard link, copying only across filesystems"""
+    dataset_path = os.path.join(DATASET_DIR, filename)
+    try:
+        os.link(src_path, dataset_path)
+    except FileExistsError:
+        # Replace a stale dataset entry rather than writing through into whatever it links to
+        os.remove(dataset_path)
+        os.link(src_path, dataset_path)
+    except OSError:
+        # Cross-device or link-less filesystem
+        shutil.copy2(src_path, dataset_path)
+
+def cached_per_file(func):
+    """Cache func(file_path, mtime) per file, dropping least recently used files past SBOM_CACHE_MAX_BYTES"""
+    # file_path -> (mtime, file size, result); a newer mtime replaces the file's old entry
+    cache = OrderedDict()
+    lock = threading.Lock()
+    total_bytes = 0
+    
+    @wraps(func)
+    def wrapper(file_path, mtime):
+        nonlocal total_bytes
+        with lock:
+            entry = cache.get(file_path)
+            if entry and entry[0] == mtime:
+                cache.move_to_end(file_path)
+                return entry[2]
+        result = func(file_path, mtime)
+        size = os.path.getsize(file_path)
+        with lock:
+            previous = cache.pop(file_path, None)
+            if previous:
+                total_bytes -= previous[1]
+            # A file over the whole budget is returned without evicting everything else for it
+            if size <= SBOM_CACHE_MAX_BYTES:
+                cache[file_path] = (mtime, size, result)
+                total_bytes += size
+                while total_bytes > SBOM_CACHE_MAX_BYTES:
+                    _, (_, evicted_size, _) = cache.popitem(last=False)
+                    total_bytes -= evicted_size
+        return result
+    return wrapper
+
+@cached_per_file
+def _load_sbom_at(file_path, mtime):
+    return load_sbom_json(file_path)
+
+def load_sbom_cached(file_path):
+    """Parse an SBOM file, reusing the previous result while its mtime is unchanged"""
+    return _load_sbom_at(file_path, os.path.getmtime(file_path))
+
+@cached_per_file
+def _component_search_index(file_path, mtime):
+    # All text json_contains would test, per component, lowered once and joined into one string;
+    # NUL separators keep a match from spanning two components
+    components = extract_components_from_sbom(_load_sbom_at(file_path, mtime))
+    texts = []
+    for component in components:
+        parts = []
+        collect_search_text(component, parts)
+        texts.append("\0".join(parts))
+    starts = []
+    offset = 0
+    for component_text in texts:
+        starts.append(offset)
+        offset += len(component_text) + 1
+    return components, "\0".join(texts), starts
+
+def find_components(file_path, keyword):
+    """Components of an SBOM file whose keys or scalars contain a lowercase keyword, in file order"""
+    components, blob, starts = _component_search_index(file_path, os.path.getmtime(file_path))
+    matches = []
+    pos = blob.find(keyword)
+    while pos != -1:
+        index = bisect_right(starts, pos) - 1
+        matches.append(components[index])
+        if index + 1 == len(starts):
+            break
+        pos = blob.find(keyword, starts[index + 1])
+    return matches
 
-def extract_components_from_sbom(sbom_data):
-    """Extract components from SBOM based on format (CycloneDX, SPDX, etc.)"""
-    # Try CycloneDX format
-    if "components" in sbom_data:
-        return sbom_data.get("components", [])
+@lru_cache(maxsize=1024)
+def check_sbom_json(file_path, mtime_ns):
+    """Raise JSONDecodeError unless the file is valid JSON; checked once per file version"""
+    load_sbom_json(file_path)
+    return True
+
+def stream_sbom_response(metadata, file_path):
+    """Wrap the raw SBOM file bytes in the {"metadata", "sbom_data"} envelope without re-serializing them"""
+    prefix = b'{"metadata":' + json_dumps(metadata, sort_keys=True) + b',"sbom_data":'
+    suffix = b'}'
     
-    # Try SPDX format
-    if "packages" in sbom_data:
-        return sbom_data.get("packages", [])
+    def generate():
+        yield prefix
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
+        yield suffix
     
-    # Try Syft format
-    if "artifacts" in sbom_data:
-        return sbom_data.get("artifacts", [])
+    response = app.response_class(generate(), mimetype='application/json')
+    response.content_length = len(prefix) + os.path.getsize(file_path) + len(suffix)
+    return response
+
+def store_artifact_rows(sbom, file_path, rows):
+    """Replace the Artifact rows for an SBOM with the collected tuples; the caller commits"""
+    stat = os.stat(file_path)
+    Artifact.query.filter_by(sbom_id=sbom.id).delete()
+    if rows:
+        db.session.bulk_insert_mappings(Artifact, [
+            {"sbom_id": sbom.id, "name": name, "version": version,
+             "license_id": license_id, "supplier": supplier}
+            for name, version, license_id, supplier in rows
+        ])
+    db.session.merge(ArtifactIndex(sbom_id=sbom.id, file_mtime=stat.st_mtime, file_size=stat.st_size))
+
+def refresh_artifact_index():
+    """Index SBOMs with no Artifact rows yet or whose file changed since they were indexed"""
+    indexed = (db.session.query(SBOM.id, SBOM.filename, ArtifactIndex.file_mtime, ArtifactIndex.file_size)
+               .outerjoin(ArtifactIndex, ArtifactIndex.sbom_id == SBOM.id)
+               .all())
+    pending = []
+    for sbom in indexed:
+        path = get_sbom_file_path(sbom.filename)
+        if not path:
+            continue
+        # A stat per file is far cheaper than reparsing to detect changes
+        stat = os.stat(path)
+        if sbom.file_mtime != stat.st_mtime or sbom.file_size != stat.st_size:
+            pending.append((sbom, path))
+    if not pending:
+        return
     
-    # Default fallback
-    return []
+    paths = [path for _, path in pending]
+    if len(paths) < ARTIFACT_INDEX_POOL_MIN_FILES:
+        results = [collect_artifact_rows(path) for path in paths]
+    else:
+        # Parsing is CPU-bound, so spread it across processes and keep the database writes in
+        # this one. Spawned rather than forked: this runs beside other threads, and a forked
+        # child could inherit a lock one of them held. The workers only import sbom_parser,
+        # which does no Flask or database setup
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(paths)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            results = list(executor.map(collect_artifact_rows, paths, chunksize=8))
+    
+    for (sbom, path), rows in zip(pending, results):
+        store_artifact_rows(sbom, path, rows)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker indexed the same SBOMs concurrently
+        db.session.rollback()
+
+def collect_search_text(value, parts):
+    """Append the lowercase keys and scalars of a parsed JSON value that json_contains matches against"""
+    if isinstance(value, str):
+        parts.append(value.lower())
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            parts.append(key.lower())
+            collect_search_text(item, parts)
+    elif isinstance(value, list):
+        for item in value:
+            collect_search_text(item, parts)
+    elif isinstance(value, bool):
+        parts.append('true' if value else 'false')
+    elif value is None:
+        parts.append('null')
+    elif isinstance(value, (int, float)):
+        parts.append(str(value))
+
+def sbom_may_contain(file_path, keyword):
+    """Raw-byte pre-check for component search: False only if no key or scalar of the file can contain keyword"""
+    # Numbers match by their Python repr and quotes/backslashes are always escaped in JSON,
+    # so such keywords cannot be ruled out from the raw bytes
+    if (not keyword.isascii() or set(keyword) <= FLOAT_REPR_CHARS
+            or any(ch in '"\\' or ch < ' ' for ch in keyword)):
+        return True
+    
+    # Besides the keyword itself, look for any other spelling of its characters:
+    # \u escapes, escaped slashes and non-ASCII look-alikes that lowercase to them
+    literals = [keyword.encode()]
+    if '/' in keyword:
+        literals.append(b'\\/')
+    escaped = set()
+    for ch in set(keyword):
+        escaped.update(f'{ord(variant):04x}' for variant in (ch, ch.upper()))
+        lookalike = ASCII_LOWERCASE_LOOKALIKES.get(ch)
+        if lookalike:
+            literals.append(lookalike.encode())
+            escaped.add(f'{ord(lookalike):04x}')
+    escape_pattern = re.compile(rb'\\u(?:' + b'|'.join(code.encode() for code in sorted(escaped)) + rb')')
+    
+    # Lowercase the memory-mapped file a chunk at a time, overlapping chunks by a needle length
+    overlap = len(keyword) + 5
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, len(mm), SEARCH_SCAN_CHUNK_SIZE):
+            chunk = mm[start:start + SEARCH_SCAN_CHUNK_SIZE + overlap].lower()
+            if any(literal in chunk for literal in literals) or escape_pattern.search(chunk):
+                return True
+    return False
+
+def json_contains(value, keyword):
+    """Check whether a lowercase keyword occurs in any key or scalar of a parsed JSON value"""
+    if isinstance(value, str):
+        return keyword in value.lower()
+    if isinstance(value, dict):
+        return any(keyword in key.lower() or json_contains(item, keyword) for key, item in value.items())
+    if isinstance(value, list):
+        return any(json_contains(item, keyword) for item in value)
+    # true/false/null match as their JSON literals, as they did when components were serialized
+    if isinstance(value, bool):
+        return keyword in ('true' if value else 'false')
+    if value is None:
+        return keyword in 'null'
+    if isinstance(value, (int, float)):
+        return keyword in str(value)
+    return False
 
 def get_component_key(component):
     """Generate a unique key for a component for comparison"""
@@ -700,86 +1317,234 @@ def get_component_key(component):
     if name and version:
         return f"{name}@{version}"
     
-    return str(component)
+    # Digest of the canonical JSON: independent of key order and compact to hash
+    return hashlib.blake2b(json_dumps(component, sort_keys=True), digest_size=16).digest()
 
-def get_component_licenses(component):
-    """Extract license information from a component"""
-    licenses = []
+def compute_statistics(filters):
+    """Aggregate SBOM statistics for the SBOM rows matching filters"""
+    # Totals and averages in a single aggregate query
+    total_sboms, total_components, average_components, average_licenses = (
+        db.session.query(func.count(SBOM.id), func.sum(SBOM.total_components),
+                         func.avg(SBOM.total_components), func.avg(SBOM.unique_licenses))
+        .filter(*filters)
+        .one())
+    
+    stats = {
+        "total_sboms": total_sboms,
+        "total_components": total_components or 0,
+        "average_components_per_sbom": round(average_components, 2) if total_sboms else 0,
+        "average_unique_licenses": round(average_licenses, 2) if total_sboms else 0
+    }
     
-    # Handle CycloneDX format
-    if "licenses" in component:
-        for lic in component.get("licenses", []):
-            if isinstance(lic, dict):
-                if "license" in lic and isinstance(lic["license"], dict):
-                    licenses.append(lic["license"].get("id", "Unknown"))
-                elif "expression" in lic:
-                    licenses.append(lic["expression"])
+    # Aggregate licenses from the Artifact table instead of re-parsing files
+    license_count = func.count(Artifact.id)
+    license_rows = (db.session.query(Artifact.license_id, license_count)
+                    .join(SBOM, SBOM.id == Artifact.sbom_id)
+                    .filter(*filters)
+                    .group_by(Artifact.license_id)
+                    # Break ties by first appearance, matching Counter.most_common
+                    .order_by(license_count.desc(), func.min(Artifact.id))
+                    .limit(10)
+                    .all())
     
-    # Handle SPDX format
-    if "licenseConcluded" in component and component["licenseConcluded"]:
-        licenses.append(component["licenseConcluded"])
+    # Add distribution data to statistics
+    stats["os_distribution"] = top_sbom_values(SBOM.operating_system, filters, limit=None)
+    stats["category_distribution"] = top_sbom_values(SBOM.category, filters, limit=None)
+    stats["binary_type_distribution"] = top_sbom_values(SBOM.app_binary_type, filters, limit=None)
+    stats["supplier_distribution"] = top_sbom_values(SBOM.supplier, filters)
+    stats["manufacturer_distribution"] = top_sbom_values(SBOM.manufacturer, filters)
+    stats["license_distribution"] = dict(license_rows)
+
+    return stats
+
+def top_sbom_values(column, filters, limit=10):
+    """Count the most common values of an SBOM column in SQL; limit=None returns the full distribution"""
+    value = func.coalesce(func.nullif(column, ""), "Unknown")
+    count = func.count(SBOM.id)
+    # Break ties by first appearance, matching Counter.most_common
+    rows = (db.session.query(value, count)
+            .filter(*filters)
+            .group_by(value)
+            .order_by(count.desc(), func.min(SBOM.id))
+            .limit(limit)
+            .all())
+    return dict(rows)
+
+def platform_binary_types():
+    """Per platform, (binary_type, count, total_components) groups from one conditional-aggregate query"""
+    binary_type = func.coalesce(func.nullif(SBOM.app_binary_type, ""), "Unknown")
+    columns = []
+    for pattern in PLATFORM_PATTERNS.values():
+        # An SBOM can match several platform patterns, so each platform gets its own aggregates
+        matches = SBOM.operating_system.ilike(pattern)
+        columns += [
+            func.sum(case((matches, 1), else_=0)),
+            func.sum(case((matches, SBOM.total_components), else_=0)),
+            func.min(case((matches, SBOM.id)))
+        ]
+    rows = db.session.query(binary_type, *columns).group_by(binary_type).all()
     
-    # Handle Syft format
-    if "licenseDeclared" in component and component["licenseDeclared"]:
-        licenses.append(component["licenseDeclared"])
+    binary_types = {}
+    for offset, platform_name in enumerate(PLATFORM_PATTERNS):
+        count_column, components_column, first_column = 3 * offset + 1, 3 * offset + 2, 3 * offset + 3
+        # Most common first, ties by first appearance as with Counter.most_common
+        groups = sorted((row for row in rows if row[count_column]),
+                        key=lambda row: (-row[count_column], row[first_column]))
+        binary_types[platform_name] = [(row[0], row[count_column], row[components_column] or 0) for row in groups]
+    return binary_types
+
+def platform_top_licenses(limit):
+    """Most common licenses per platform, from one grouped pass over the Artifact table"""
+    platform_counts = [
+        func.sum(case((SBOM.operating_system.ilike(pattern), 1), else_=0))
+        for pattern in PLATFORM_PATTERNS.values()
+    ]
+    rows = (db.session.query(Artifact.license_id, func.min(Artifact.id), *platform_counts)
+            .join(SBOM, SBOM.id == Artifact.sbom_id)
+            .group_by(Artifact.license_id)
+            .all())
     
-    return licenses if licenses else ["Unknown"]
+    top_licenses = {}
+    for column, platform_name in enumerate(PLATFORM_PATTERNS, start=2):
+        # Break ties by first appearance, matching Counter.most_common
+        ranked = heapq.nsmallest(limit, (row for row in rows if row[column]),
+                                 key=lambda row: (-row[column], row[1]))
+        top_licenses[platform_name] = {row[0]: row[column] for row in ranked}
+    return top_licenses
+
+def refresh_stats_snapshot():
+    """Recompute the unfiltered statistics and store them as the snapshot"""
+    payload = compute_statistics([])
+    db.session.merge(StatsSnapshot(id=1, payload=payload, updated_at=datetime.utcnow()))
+    db.session.commit()
+
+def invalidate_stats_snapshot():
+    """Drop the statistics snapshot; the caller commits and then wakes the refresher"""
+    StatsSnapshot.query.delete()
+
+def acquire_stats_refresher_lock():
+    """Block until this process holds the refresher lock; the returned file must stay open to keep it"""
+    with app.app_context():
+        lock_path = f"{db.engine.url.database}.refresher.lock"
+    lock_file = open(lock_path, 'a')
+    if fcntl is not None:
+        # Held until the process exits, when a standby refresher in another worker takes over
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+    return lock_file
+
+def refresh_stats_loop():
+    """Background loop keeping the statistics snapshot up to date"""
+    lock_file = acquire_stats_refresher_lock()
+    seen_version, refreshed_at = None, 0
+    while True:
+        try:
+            with app.app_context():
+                # Writes from other workers or tools only show up in the data version
+                version = sbom_data_version()
+                if (version != seen_version or stats_refresh_event.is_set()
+                        or time.monotonic() - refreshed_at >= STATS_REFRESH_INTERVAL):
+                    stats_refresh_event.clear()
+                    # Uploads index their own artifacts; this catches files changed on disk
+                    # and rows written by other tools, so request handlers stay read-only
+                    refresh_artifact_index()
+                    refresh_stats_snapshot()
+                    # Reindexing bumps the version itself, costing one extra pass that finds nothing to do
+                    seen_version, refreshed_at = version, time.monotonic()
+        except Exception as e:
+            print(f"Error refreshing statistics snapshot: {e}")
+        stats_refresh_event.wait(STATS_POLL_INTERVAL)
+
+def start_stats_refresher():
+    """Start the statistics refresh thread once per process; across processes only the lock holder refreshes"""
+    global stats_refresh_thread
+    if stats_refresh_thread is not None and stats_refresh_thread.is_alive():
+        return
+    # Called from every request, so concurrent first requests must not start two
+    with stats_refresh_thread_lock:
+        if stats_refresh_thread is None or not stats_refresh_thread.is_alive():
+            stats_refresh_thread = threading.Thread(target=refresh_stats_loop, daemon=True)
+            stats_refresh_thread.start()
 
 def count_licenses(components):
     """Count license occurrences in components"""
-    license_counter = Counter()
-    
-    for component in components:
-        for license_info in get_component_licenses(component):
-            license_counter[license_info] += 1
-    
+    # Counter counts an iterable in C; most_common(n) selects with heapq.nlargest
+    license_counter = Counter(
+        license_info
+        for component in components
+        for license_info in get_component_licenses(component)
+    )
     return dict(license_counter.most_common(10))
 
-def get_sbom_data_and_meta(filename):
-    """Get SBOM data and metadata for a file"""
-    # Get the file path
-    file_path = get_sbom_file_path(filename)
+@cached_per_file
+def _compare_index_at(file_path, mtime):
+    sbom_data = _load_sbom_at(file_path, mtime)
+    if not sbom_data:
+        return None
+    components = extract_components_from_sbom(sbom_data)
+    keys = [get_component_key(comp) for comp in components]
+    return components, keys, dict(zip(keys, components)), count_licenses(components)
+
+def same_file(path1, path2):
+    """True if both paths name the same file on disk (same device and inode)"""
+    try:
+        return path1 == path2 or os.path.samefile(path1, path2)
+    except OSError:
+        return False
+
+def load_compare_index_or_none(file_path):
+    """Components, keys, key map and license counts of an SBOM, cached by mtime; None if missing or unreadable"""
     if not file_path:
-        return None, None
-    
-    # Load SBOM data
+        return None
     try:
-        with open(file_path, 'r') as f:
-            sbom_data = json.load(f)
+        return _compare_index_at(file_path, os.path.getmtime(file_path))
     except Exception:
-        return None, None
-    
-    # Get metadata
-    sbom = SBOM.query.filter_by(filename=filename).first()
-    metadata = {
-        "filename": filename,
-        "app_name": sbom.app_name if sbom else os.path.splitext(filename)[0],
-        "category": sbom.category if sbom else "Unknown",
-        "operating_system": sbom.operating_system if sbom else "Unknown",
-        "app_binary_type": sbom.app_binary_type if sbom else "Unknown",
-        "supplier": sbom.supplier if sbom else "Unknown",
-        "manufacturer": sbom.manufacturer if sbom else "Unknown",
-        "version": sbom.version if sbom else "Unknown"
-    }
-    
-    return sbom_data, metadata
+        return None
+
+def get_sbom_meta(filename):
+    """Get the comparison metadata for an SBOM file"""
+    row = db.session.query(SBOM.app_name, *SBOM_META_COLUMNS).filter(SBOM.filename == filename).first()
+    if row is None:
+        return {"filename": filename, "app_name": os.path.splitext(filename)[0], **SBOM_META_DEFAULTS}
+    return {"filename": filename, **row._asdict()}
+
+def refresh_sbom_path_index(force=False):
+    """Return the filename -> path index, rescanning SBOM_DIR and DATASET_DIR if either changed"""
+    global sbom_path_index, sbom_path_index_stamp, sbom_path_index_checked
+    with sbom_path_index_lock:
+        now = time.monotonic()
+        if not force and now - sbom_path_index_checked < SBOM_PATH_INDEX_TTL:
+            return sbom_path_index
+        # Stamp before scanning so a file added mid-scan triggers another rescan
+        stamp = (os.stat(SBOM_DIR).st_mtime_ns, os.stat(DATASET_DIR).st_mtime_ns)
+        if stamp != sbom_path_index_stamp:
+            index = {name: os.path.join(DATASET_DIR, name) for name in list_dir_files(DATASET_DIR)}
+            index.update((name, os.path.join(SBOM_DIR, name)) for name in list_dir_files(SBOM_DIR))
+            sbom_path_index, sbom_path_index_stamp = index, stamp
+        sbom_path_index_checked = now
+        return sbom_path_index
 
 def get_sbom_file_path(filename):
     """Find SBOM file in different directories"""
-    # Check SBOM_DIR
-    file_path = os.path.join(SBOM_DIR, filename)
-    if os.path.exists(file_path):
-        return file_path
-    
-    # Check DATASET_DIR
-    file_path = os.path.join(DATASET_DIR, filename)
-    if os.path.exists(file_path):
-        return file_path
+    # The index only holds the files directly in each directory, so probe for subpaths
+    if os.sep in filename or (os.altsep and os.altsep in filename):
+        for directory in (SBOM_DIR, DATASET_DIR):
+            file_path = os.path.join(directory, filename)
+            if os.path.exists(file_path):
+                return file_path
+        return None
     
-    return None
+    file_path = refresh_sbom_path_index().get(filename)
+    if file_path is None:
+        # A miss may be a file added since the last check, so look again now
+        file_path = refresh_sbom_path_index(force=True).get(filename)
+    return file_path
 
 # Initialize DB
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-    app.run(debug=True, port=5001)
+    debug = True
+    ensure_db_initialized()
+    # Under gunicorn the refresher is started from post_fork instead (see gunicorn.conf.py).
+    # The debug reloader's parent process only watches files, so it is skipped there
+    if not debug or is_running_from_reloader():
+        start_stats_refresher()
+    app.run(debug=debug, port=5001)
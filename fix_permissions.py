@@ -7,18 +7,17 @@ def fix_directory_permissions(directory):
     """
     Fix permissions for a directory and all its contents.
     """
-    if not os.path.exists(directory):
+    try:
+        # Set directory to be writable by everyone
+        os.chmod(directory, 0o777)
+        print(f"Set permissions for: {directory}")
+    except FileNotFoundError:
         print(f"Creating directory: {directory}")
         os.makedirs(directory, exist_ok=True, mode=0o777)
-    else:
-        print(f"Setting permissions for: {directory}")
-        try:
-            # Set directory to be writable by everyone
-            os.chmod(directory, 0o777)
-        except PermissionError as e:
-            print(f"Error setting permissions on {directory}: {e}")
-            print("You may need to run this script with sudo")
-            return False
+    except PermissionError as e:
+        print(f"Error setting permissions on {directory}: {e}")
+        print("You may need to run this script with sudo")
+        return False
     
     return True
 
@@ -4,8 +4,16 @@ import json
 import shutil
 import random
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+# orjson writes the indented documents far faster than the pure-Python indenting encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 DATASET_DIR = "./SBOM Dataset"
 LOCAL_BACKUP_DIR = os.path.expanduser("~/local_sbom_backup")
@@ -116,6 +124,19 @@ COMPONENT_CATEGORIES = [
     "device", "firmware", "container", "platform", "file"
 ]
 
+# Value ranges for random versions and dates, drawn in bulk per SBOM
+VERSION_MAJORS = range(1, 11)
+VERSION_MINORS = range(0, 21)
+VERSION_PATCHES = range(0, 100)
+DATE_YEARS = range(2018, 2026)
+DATE_MONTHS = range(1, 13)
+DATE_DAYS = range(1, 29)
+LICENSE_COUNTS = (1, 1, 1, 2)  # more likely to have 1
+
+# Parts of generated component names
+COMPONENT_NAME_PREFIXES = ["lib", "core", "api", "module", "plugin", "service", "util", "framework", "engine", "sdk"]
+COMPONENT_NAME_SUFFIXES = ["", "-js", "-lib", "-core", "-api", "-utils", "-common", "-base", "-client", "-server"]
+
 def generate_random_version():
     """Generate a random version string"""
     major = random.randint(1, 10)
@@ -123,25 +144,46 @@ def generate_random_version():
     patch = random.randint(0, 99)
     return f"{major}.{minor}.{patch}"
 
-def generate_random_date():
-    """Generate a random date in the last 5 years"""
-    year = random.randint(2018, 2025)
-    month = random.randint(1, 12)
-    day = random.randint(1, 28)
-    return f"{year}-{month:02d}-{day:02d}T00:00:00Z"
+def generate_random_versions(count):
+    """Generate count random version strings at once"""
+    return [
+        f"{major}.{minor}.{patch}"
+        for major, minor, patch in zip(random.choices(VERSION_MAJORS, k=count),
+                                       random.choices(VERSION_MINORS, k=count),
+                                       random.choices(VERSION_PATCHES, k=count))
+    ]
 
-def generate_random_component_name(app_name):
-    """Generate a random component name related to the app"""
-    prefixes = ["lib", "core", "api", "module", "plugin", "service", "util", "framework", "engine", "sdk"]
-    suffixes = ["", "-js", "-lib", "-core", "-api", "-utils", "-common", "-base", "-client", "-server"]
-    
-    # Either use app name as prefix or choose a random prefix
-    if random.choice([True, False]):
-        name_part = f"{app_name}-{random.choice(prefixes)}"
+def generate_random_dates(count):
+    """Generate count random dates in the last 5 years at once"""
+    return [
+        f"{year}-{month:02d}-{day:02d}T00:00:00Z"
+        for year, month, day in zip(random.choices(DATE_YEARS, k=count),
+                                    random.choices(DATE_MONTHS, k=count),
+                                    random.choices(DATE_DAYS, k=count))
+    ]
+
+def generate_random_component_names(app_name, count):
+    """Generate count distinct random component names related to the app"""
+    names = {}
+    while len(names) < count:
+        # Draw the missing names in one batch; repeats are dropped and drawn again
+        missing = count - len(names)
+        for app_first, prefix, suffix in zip(random.choices((True, False), k=missing),
+                                             random.choices(COMPONENT_NAME_PREFIXES, k=missing),
+                                             random.choices(COMPONENT_NAME_SUFFIXES, k=missing)):
+            # Either use app name as prefix or choose a random prefix
+            name_part = f"{app_name}-{prefix}" if app_first else f"{prefix}-{app_name}"
+            names[name_part + suffix] = None
+    return list(names)
+
+def write_json(file_path, data):
+    """Write data as 2-space indented JSON"""
+    if orjson is not None:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     else:
-        name_part = f"{random.choice(prefixes)}-{app_name}"
-    
-    return name_part + random.choice(suffixes)
+        with open(file_path, 'w') as f:
+            json.dump(data, f, indent=2)
 
 def create_sample_sbom(name, supplier, os_name, app_type="desktop", version=None, min_components=5, max_components=30):
     """Create a sample SBOM file with random but realistic data"""
@@ -185,53 +227,48 @@ def create_sample_sbom(name, supplier, os_name, app_type="desktop", version=None
     # Determine number of components
     num_components = random.randint(min_components, max_components)
     
-    # Add some dependencies (random components)
-    used_names = set()
-    for i in range(num_components):
-        # Generate a unique component name
-        while True:
-            component_name = generate_random_component_name(name)
-            if component_name not in used_names:
-                used_names.add(component_name)
-                break
-        
-        component_version = generate_random_version()
-        component_type = random.choice(COMPONENT_CATEGORIES)
-        
-        # Generate licenses (1 or 2)
-        license_count = random.choice([1, 1, 1, 2])  # more likely to have 1
-        licenses = []
-        for _ in range(license_count):
-            license_id = random.choice(COMMON_LICENSES)
-            licenses.append({
-                "license": {
-                    "id": license_id
-                }
-            })
-        
-        sbom_data["components"].append({
+    # Add some dependencies (random components), every per-component value drawn
+    # in bulk, one column at a time
+    component_names = generate_random_component_names(name, num_components)
+    component_versions = generate_random_versions(num_components)
+    component_types = random.choices(COMPONENT_CATEGORIES, k=num_components)
+    modified_dates = generate_random_dates(num_components)
+    
+    # Generate licenses (1 or 2)
+    license_counts = random.choices(LICENSE_COUNTS, k=num_components)
+    license_ids = iter(random.choices(COMMON_LICENSES, k=sum(license_counts)))
+    
+    sbom_data["components"] = [
+        {
             "type": component_type,
             "bom-ref": f"pkg:generic/{component_name}@{component_version}",
             "name": component_name,
             "version": component_version,
             "purl": f"pkg:generic/{component_name}@{component_version}",
-            "licenses": licenses,
+            "licenses": [{"license": {"id": next(license_ids)}} for _ in range(license_count)],
             "properties": [
-                {"name": "last-modified", "value": generate_random_date()}
+                {"name": "last-modified", "value": modified_date}
             ]
-        })
+        }
+        for component_name, component_version, component_type, license_count, modified_date
+        in zip(component_names, component_versions, component_types, license_counts, modified_dates)
+    ]
     
     # Create the filename based on the parameters
     filename = f"{supplier}-{name}-{os_name}-{app_type}.json"
     file_path = os.path.join(DATASET_DIR, filename)
     
     # Save the SBOM to the main dataset directory
-    with open(file_path, 'w') as f:
-        json.dump(sbom_data, f, indent=2)
+    write_json(file_path, sbom_data)
     
     log_message(f"✅ Saved SBOM to {file_path}")
     return filename, file_path
 
+def create_sample_sbom_task(task):
+    """Process pool entry point: create_sample_sbom for one (category, app, platform) task"""
+    _, name, supplier, os_name, app_type, version, min_components, max_components = task
+    return create_sample_sbom(name, supplier, os_name, app_type, version, min_components, max_components)
+
 def backup_sbom(filename, source_path, backup_dir):
     """Backup an SBOM file to the specified directory"""
     backup_path = os.path.join(backup_dir, filename)
@@ -255,47 +292,53 @@ def main():
         "ios": 0
     }
     
+    # One task per (app, platform); each SBOM is independent, so they are generated across processes
+    tasks = []
     for category, apps in APPLICATION_TEMPLATES.items():
         log_message(f"Processing category: {category}")
-        category_count = 0
         total_categories += 1
         
         for app in apps:
-            app_name = app["name"]
-            supplier = app["supplier"]
-            
             for platform in app["platforms"]:
-                # Choose random app version
-                version = generate_random_version()
-                
                 # Determine app type (mobile platforms are mobile, others are desktop)
                 app_type = "mobile" if platform in ["android", "ios"] else "desktop"
-                
-                # Create the SBOM
-                filename, file_path = create_sample_sbom(
-                    app_name, 
-                    supplier, 
-                    platform, 
-                    app_type, 
-                    version, 
-                    min_components=5 if app_type == "mobile" else 10,
-                    max_components=20 if app_type == "mobile" else 50
-                )
-                
-                # Backup to local directory
-                backup_sbom(filename, file_path, LOCAL_BACKUP_DIR)
-                
-                # Backup to Windows directory
-                try:
-                    if os.path.exists(WINDOWS_DIR):
-                        backup_sbom(filename, file_path, WINDOWS_DIR)
-                except Exception as e:
-                    log_message(f"⚠️ Warning: Could not backup to Windows directory: {e}")
-                
-                category_count += 1
-                total_generated += 1
-                platform_counts[platform] += 1
-        
+                tasks.append((
+                    category,
+                    app["name"],
+                    app["supplier"],
+                    platform,
+                    app_type,
+                    generate_random_version(),  # Choose random app version
+                    5 if app_type == "mobile" else 10,
+                    20 if app_type == "mobile" else 50
+                ))
+    
+    category_counts = Counter(task[0] for task in tasks)
+    with ProcessPoolExecutor() as pool:
+        generated = list(pool.map(create_sample_sbom_task, tasks, chunksize=8))
+    
+    # Backups are plain file copies, so threads are enough
+    backup_dirs = [LOCAL_BACKUP_DIR]
+    if os.path.exists(WINDOWS_DIR):
+        backup_dirs.append(WINDOWS_DIR)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        backups = [
+            (backup_dir, pool.submit(backup_sbom, filename, file_path, backup_dir))
+            for filename, file_path in generated
+            for backup_dir in backup_dirs
+        ]
+        for backup_dir, backup in backups:
+            try:
+                backup.result()
+            except Exception as e:
+                if backup_dir != WINDOWS_DIR:
+                    raise
+                log_message(f"⚠️ Warning: Could not backup to Windows directory: {e}")
+    
+    total_generated = len(generated)
+    for task in tasks:
+        platform_counts[task[3]] += 1
+    for category, category_count in category_counts.items():
         log_message(f"✅ Generated {category_count} SBOMs for category: {category}")
     
     # Final statistics
@@ -4,37 +4,69 @@ import json
 import subprocess
 import shutil
 import logging
+import logging.handlers
+import atexit
+import queue
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# orjson parses and re-indents the Syft documents far faster than the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 DATASET_DIR = "./SBOM Dataset"
 LOCAL_BACKUP_DIR = os.path.expanduser("~/local_sbom_backup")
 WINDOWS_DIR = "/mnt/c/Users/Gunty Snehajoyce/Documents/SBOM"  # WSL path to Windows location
 SBOM_FILES_DIR = "./sbom_files"
 LOG_FILE = "sbom_generation.log"
+# Which package version each stored SBOM was generated from, so re-runs skip unchanged packages
+SBOM_CACHE_FILE = ".sbom_cache.json"
+# Generated SBOMs are written compact; set SBOM_PRETTY=1 for 2-space indented output
+SBOM_PRETTY = os.environ.get("SBOM_PRETTY", "") not in ("", "0")
+# Date stamp for this run's SBOM filenames, fixed once so a run never mixes dates
+TIMESTAMP = datetime.now().strftime("%Y%m%d")
+# Concurrent syft scans; each is its own subprocess, so threads are enough to overlap them.
+# Half the CPUs by default, leaving each scan a couple of cores for its own parallel catalogers
+CPU_COUNT = os.cpu_count() or 4
+SBOM_WORKERS = max(1, int(os.environ.get("SBOM_WORKERS", CPU_COUNT // 2)))
+# Every syft child inherits these: one shared cache dir (tmpfs when available) so lookups
+# fetched by one scan are reused by the rest, and a per-scan parallelism cap so
+# SBOM_WORKERS concurrent scans split the CPUs between them instead of each claiming all of them
+SYFT_CACHE_DIR = "/dev/shm/syft-cache" if os.path.isdir("/dev/shm") else os.path.expanduser("~/.cache/syft")
+os.environ.setdefault("SYFT_CACHE_DIR", SYFT_CACHE_DIR)
+os.environ.setdefault("SYFT_PARALLELISM", str(max(1, CPU_COUNT // SBOM_WORKERS)))
 
-# Setup logging
+# Setup logging: records are formatted by the queue handler and written to the file by a
+# background listener, so scan threads never wait on file I/O. Stdout stays synchronous so
+# log lines appear in order with the interactive prompts
+log_queue = queue.SimpleQueue()
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue), logging.StreamHandler(sys.stdout)]
 )
+log_listener = logging.handlers.QueueListener(log_queue, logging.FileHandler(LOG_FILE))
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Ensure directories exist
 os.makedirs(DATASET_DIR, exist_ok=True)
 os.makedirs(LOCAL_BACKUP_DIR, exist_ok=True)
 os.makedirs(SBOM_FILES_DIR, exist_ok=True)
+# Checked once here: every stat on the /mnt/c bridge is slow, so backups rely on this flag
 try:
     os.makedirs(WINDOWS_DIR, exist_ok=True)
     logger.info(f"Windows directory created/verified: {WINDOWS_DIR}")
+    WINDOWS_AVAILABLE = True
 except Exception as e:
     logger.warning(f"Could not create Windows directory: {e}")
+    WINDOWS_AVAILABLE = False
 
 # List of common Linux applications for SBOM generation
 APPLICATIONS = [
@@ -92,12 +124,11 @@ if os.path.exists(CUSTOM_APPS_FILE):
         logger.error(f"Error loading custom applications: {e}")
 
 def run_command(command):
-    """Run a shell command and return the output"""
-    logger.info(f"Running command: {command}")
+    """Run a command given as an argument list and return the output"""
+    logger.info(f"Running command: {' '.join(command)}")
     try:
         result = subprocess.run(
             command, 
-            shell=True, 
             check=True, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE,
@@ -112,15 +143,9 @@ def run_command(command):
 def check_syft_installed():
     """Check if Syft is installed"""
     logger.info("Checking if Syft is installed...")
-    result = subprocess.run(
-        ["which", "syft"], 
-        stdout=subprocess.PIPE, 
-        stderr=subprocess.PIPE,
-        universal_newlines=True
-    )
-    
-    if result.returncode != 0:
+    if shutil.which("syft") is None:
         logger.warning("Syft not found. Installing Syft...")
+        # A genuine pipeline, so this one install step still goes through the shell
         install_syft_command = "curl -sSfL https://raw.githubusercontent.com/anchore/syft/main/install.sh | sh -s -- -b /usr/local/bin"
         try:
             subprocess.run(
@@ -139,129 +164,194 @@ def check_syft_installed():
         logger.info("Syft is already installed")
         return True
 
-def install_application(app):
-    """Install an application using apt-get"""
+def get_installed_packages():
+    """Versions of all fully installed packages (dpkg status 'ii') keyed by name, from a single dpkg-query call"""
+    try:
+        result = subprocess.run(
+            ["dpkg-query", "-W", "-f", "${Package}\t${Status}\t${Version}\n"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+    except FileNotFoundError:
+        logger.warning("dpkg-query not found; treating all packages as not installed")
+        return {}
+    
+    installed = {}
+    for line in result.stdout.splitlines():
+        package_name, status, version = (line.split("\t") + ["", ""])[:3]
+        if status == "install ok installed":
+            installed[package_name] = version
+    return installed
+
+def install_application(app, installed_packages):
+    """Install an application using apt-get, recording it in installed_packages"""
     package_name = app["package"]
     logger.info(f"Installing {app['name']} ({package_name})...")
     
     # Check if package is already installed
-    check_cmd = f"dpkg -l | grep -q '^ii\\s*{package_name}\\s'"
-    result = subprocess.run(check_cmd, shell=True)
-    
-    if result.returncode == 0:
+    if package_name in installed_packages:
         logger.info(f"{package_name} is already installed")
         return True
     
     # Install the package
     try:
         # Use sudo for the installation
-        cmd = f"sudo apt-get install -y {package_name}"
+        cmd = ["sudo", "apt-get", "install", "-y", package_name]
         result = subprocess.run(
             cmd, 
-            shell=True, 
             check=True, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE,
             universal_newlines=True
         )
         logger.info(f"Successfully installed {package_name}")
+        # Version is unknown until the next dpkg snapshot
+        installed_packages[package_name] = None
         return True
     except subprocess.CalledProcessError as e:
         logger.error(f"Failed to install {package_name}: {e}")
         logger.error(f"Error output: {e.stderr}")
         return False
 
-def generate_sbom(app):
-    """Generate SBOM for an application using Syft"""
+def install_applications(apps, installed_packages):
+    """Install all missing packages with one apt-get call, returning a fresh installed-package snapshot"""
+    missing = list(dict.fromkeys(app["package"] for app in apps if app["package"] not in installed_packages))
+    if not missing:
+        return installed_packages
+    
+    logger.info(f"Installing {len(missing)} packages: {' '.join(missing)}")
+    try:
+        subprocess.run(
+            ["sudo", "apt-get", "install", "-y", *missing],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+        logger.info(f"Successfully installed {len(missing)} packages")
+    except subprocess.CalledProcessError as e:
+        # apt-get aborts the whole transaction on one bad package, so retry them one by one
+        logger.warning(f"Batch install failed ({e}), installing packages individually...")
+        for app in apps:
+            if app["package"] not in installed_packages:
+                install_application(app, installed_packages)
+    
+    # Re-read dpkg so the new packages come with their versions
+    return get_installed_packages()
+
+def find_binary(package_name):
+    """Path of a package's executable: on PATH, else the first /usr/bin or /usr/sbin file named after it"""
+    bin_path = shutil.which(package_name)
+    if bin_path:
+        return bin_path
+    for directory in ("/usr/bin", "/usr/sbin"):
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.startswith(package_name) and os.path.isfile(path) and not os.path.islink(path):
+                    return path
+    return None
+
+def load_json_bytes(data):
+    """Parse a JSON document from raw bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def write_json(file_path, data):
+    """Write data as compact JSON, or 2-space indented when SBOM_PRETTY is set"""
+    if orjson is not None:
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if SBOM_PRETTY else 0))
+    else:
+        with open(file_path, 'w') as f:
+            if SBOM_PRETTY:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+
+def load_sbom_cache():
+    """Load the package-version index of previously generated SBOMs"""
+    try:
+        with open(SBOM_CACHE_FILE, 'rb') as f:
+            return load_json_bytes(f.read())
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.warning(f"Ignoring unreadable SBOM cache {SBOM_CACHE_FILE}: {e}")
+        return {}
+
+def save_sbom_cache(sbom_cache):
+    """Persist the package-version index of generated SBOMs"""
+    try:
+        write_json(SBOM_CACHE_FILE, sbom_cache)
+    except OSError as e:
+        logger.error(f"Failed to save SBOM cache: {e}")
+
+def run_syft(cmd):
+    """Run a Syft command and return its raw (undecoded) stdout"""
+    result = subprocess.run(
+        cmd,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    return result.stdout
+
+def generate_sbom(app, version=None, sbom_cache=None):
+    """Generate SBOM for an application using Syft, reusing a cached one for the same package version"""
     app_name = app["name"]
     package_name = app["package"]
     category = app["category"]
     
+    # Reuse the SBOM from an earlier run if the installed version has not changed
+    if version and sbom_cache is not None:
+        cached = sbom_cache.get(app_name)
+        if cached and cached.get("package") == package_name and cached.get("version") == version:
+            cached_path = os.path.join(DATASET_DIR, cached["filename"])
+            if os.path.exists(cached_path):
+                logger.info(f"SBOM for {app_name} {version} is up to date: {cached_path}")
+                return cached["filename"], cached_path
+    
     logger.info(f"Generating SBOM for {app_name}...")
     
     # Create filenames
-    timestamp = datetime.now().strftime("%Y%m%d")
-    sbom_filename = f"{app_name}_{timestamp}_sbom.json"
+    sbom_filename = f"{app_name}_{TIMESTAMP}_sbom.json"
     sbom_path = os.path.join(DATASET_DIR, sbom_filename)
     
     # Generate SBOM using Syft
     try:
         # Use syft scan command to get the SBOM for the installed package
-        cmd = f"syft scan {package_name} -o cyclonedx-json"
+        cmd = ["syft", "scan", package_name, "-o", "cyclonedx-json"]
         
         # Try alternate commands if the primary one fails
         try:
-            result = subprocess.run(
-                cmd, 
-                shell=True, 
-                check=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
-            sbom_data = result.stdout
+            sbom_data = run_syft(cmd)
         except subprocess.CalledProcessError as e:
             logger.warning(f"First command failed, trying alternative syntax...")
             
             # Try alternative #1: Using "packages" instead of "scan"
-            cmd = f"syft packages {package_name} -o cyclonedx-json"
+            cmd = ["syft", "packages", package_name, "-o", "cyclonedx-json"]
             try:
-                result = subprocess.run(
-                    cmd, 
-                    shell=True, 
-                    check=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True
-                )
-                sbom_data = result.stdout
+                sbom_data = run_syft(cmd)
             except subprocess.CalledProcessError:
                 logger.warning(f"Second command failed, trying to scan binary path...")
                 
                 # Try alternative #2: Get the path to the binary and scan it directly
-                which_cmd = f"which {package_name} 2>/dev/null || find /usr/bin /usr/sbin -name '{package_name}*' -type f | head -1"
-                bin_path_result = subprocess.run(
-                    which_cmd, 
-                    shell=True, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True
-                )
+                bin_path = find_binary(package_name)
                 
-                if bin_path_result.stdout.strip():
-                    bin_path = bin_path_result.stdout.strip()
-                    cmd = f"syft scan {bin_path} -o cyclonedx-json"
-                    result = subprocess.run(
-                        cmd, 
-                        shell=True, 
-                        check=True, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.PIPE,
-                        universal_newlines=True
-                    )
-                    sbom_data = result.stdout
+                if bin_path:
+                    cmd = ["syft", "scan", bin_path, "-o", "cyclonedx-json"]
+                    sbom_data = run_syft(cmd)
                 else:
                     # If all else fails, try to scan the system package directly
-                    cmd = f"syft scan /var/lib/dpkg/info/{package_name}.list -o cyclonedx-json"
-                    result = subprocess.run(
-                        cmd, 
-                        shell=True, 
-                        check=True, 
-                        stdout=subprocess.PIPE, 
-                        stderr=subprocess.PIPE,
-                        universal_newlines=True
-                    )
-                    sbom_data = result.stdout
+                    cmd = ["syft", "scan", f"/var/lib/dpkg/info/{package_name}.list", "-o", "cyclonedx-json"]
+                    sbom_data = run_syft(cmd)
         
-        # Save SBOM to file
-        with open(sbom_path, 'w') as f:
-            f.write(sbom_data)
-        
-        logger.info(f"SBOM for {app_name} saved to {sbom_path}")
-        
-        # Parse the SBOM to add additional metadata
+        # Parse the SBOM to add additional metadata before it is written, so it hits disk once
         try:
-            sbom_json = json.loads(sbom_data)
+            sbom_json = load_json_bytes(sbom_data)
             
             # Add metadata if not present
             if "metadata" not in sbom_json:
@@ -287,45 +377,88 @@ def generate_sbom(app):
             # Add or update properties
             properties = component["properties"]
             
+            # Index existing properties by name (first occurrence wins, as the old scan did)
+            properties_by_name = {}
+            for prop in properties:
+                properties_by_name.setdefault(prop.get("name"), prop)
+            
             # Function to add or update a property
             def add_or_update_property(name, value):
-                for prop in properties:
-                    if prop.get("name") == name:
-                        prop["value"] = value
-                        return
-                properties.append({"name": name, "value": value})
+                prop = properties_by_name.get(name)
+                if prop is not None:
+                    prop["value"] = value
+                else:
+                    prop = {"name": name, "value": value}
+                    properties.append(prop)
+                    properties_by_name[name] = prop
             
             add_or_update_property("category", category)
             add_or_update_property("os", "linux")
             add_or_update_property("type", "desktop")
             
             # Save updated SBOM
-            with open(sbom_path, 'w') as f:
-                json.dump(sbom_json, f, indent=2)
+            write_json(sbom_path, sbom_json)
             
-            logger.info(f"Updated SBOM metadata for {app_name}")
+            logger.info(f"SBOM for {app_name} saved to {sbom_path} with updated metadata")
+            
+            if version and sbom_cache is not None:
+                sbom_cache[app_name] = {"package": package_name, "version": version, "filename": sbom_filename}
             
             return sbom_filename, sbom_path
             
         except json.JSONDecodeError as e:
             logger.error(f"Error parsing SBOM JSON for {app_name}: {e}")
+            # Keep Syft's output as-is
+            with open(sbom_path, 'wb') as f:
+                f.write(sbom_data)
+            logger.info(f"SBOM for {app_name} saved to {sbom_path}")
             return sbom_filename, sbom_path
             
     except subprocess.CalledProcessError as e:
         logger.error(f"Failed to generate SBOM for {app_name}: {e}")
-        logger.error(f"Error output: {e.stderr}")
+        logger.error(f"Error output: {e.stderr.decode('utf-8', 'replace')}")
         return None, None
 
+def copy_file(source_path, target_path):
+    """copy2 equivalent that lets the kernel copy (or reflink) the data with copy_file_range where it can"""
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(source_path, target_path)
+        return
+    with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+        remaining = os.fstat(src.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            # Unsupported here (older kernel, cross-filesystem, 9p/drvfs mounts)
+            pass
+        if remaining > 0:
+            # Failed or stopped short (some filesystems report 0 instead of an error): copy the rest normally
+            shutil.copyfileobj(src, dst, 1 << 20)
+    shutil.copystat(source_path, target_path)
+
+def link_or_copy(source_path, target_path):
+    """Hard-link source_path at target_path, replacing any existing file; copy across filesystems"""
+    try:
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+        os.link(source_path, target_path)
+    except OSError:
+        copy_file(source_path, target_path)
+
 def backup_sbom(filename, source_path):
     """Backup an SBOM file to multiple locations"""
     if not os.path.exists(source_path):
         logger.error(f"Source file not found: {source_path}")
         return False
     
-    # Copy to sbom_files directory
+    # Link into sbom_files directory: the app only reads it, so the file need not be duplicated
     sbom_files_path = os.path.join(SBOM_FILES_DIR, filename)
     try:
-        shutil.copy2(source_path, sbom_files_path)
+        link_or_copy(source_path, sbom_files_path)
         logger.info(f"Backed up SBOM to {sbom_files_path}")
     except Exception as e:
         logger.error(f"Failed to backup to sbom_files: {e}")
@@ -333,22 +466,34 @@ def backup_sbom(filename, source_path):
     # Copy to local backup directory
     local_backup_path = os.path.join(LOCAL_BACKUP_DIR, filename)
     try:
-        shutil.copy2(source_path, local_backup_path)
+        copy_file(source_path, local_backup_path)
         logger.info(f"Backed up SBOM to {local_backup_path}")
     except Exception as e:
         logger.error(f"Failed to backup to local directory: {e}")
     
     # Copy to Windows directory if available
-    if os.path.exists(WINDOWS_DIR):
+    if WINDOWS_AVAILABLE:
         windows_backup_path = os.path.join(WINDOWS_DIR, filename)
         try:
-            shutil.copy2(source_path, windows_backup_path)
+            copy_file(source_path, windows_backup_path)
             logger.info(f"Backed up SBOM to Windows directory: {windows_backup_path}")
         except Exception as e:
             logger.error(f"Failed to backup to Windows directory: {e}")
     
     return True
 
+def generate_and_backup_sbom(app, version=None, sbom_cache=None):
+    """Generate and back up the SBOM of an installed application, returning whether both succeeded"""
+    app_name = app["name"]
+    sbom_filename, sbom_path = generate_sbom(app, version, sbom_cache)
+    if not (sbom_filename and sbom_path):
+        logger.warning(f"Failed to generate SBOM for {app_name}")
+        return False
+    if not backup_sbom(sbom_filename, sbom_path):
+        logger.warning(f"Failed to backup SBOM for {app_name}")
+        return False
+    return True
+
 def main():
     """Main function to run the SBOM generation process"""
     logger.info("Starting SBOM generation process")
@@ -365,13 +510,16 @@ def main():
     
     # Update package lists
     logger.info("Updating package lists...")
-    update_cmd = "sudo apt-get update"
+    update_cmd = ["sudo", "apt-get", "update"]
     if run_command(update_cmd) is None:
         logger.error("Failed to update package lists. Continuing anyway...")
     
     successful_sboms = 0
     failed_sboms = 0
     skipped_apps = 0
+    
+    # One dpkg query up front instead of a dpkg -l | grep pipeline per application
+    installed_packages = get_installed_packages()
 
     # Ask user which applications to process
     print("\nAvailable applications for SBOM generation:")
@@ -391,11 +539,7 @@ def main():
         apps_to_process = APPLICATIONS
     elif choice == 'i':
         # Filter only installed applications
-        for app in APPLICATIONS:
-            check_cmd = f"dpkg -l | grep -q '^ii\\s*{app['package']}\\s'"
-            result = subprocess.run(check_cmd, shell=True)
-            if result.returncode == 0:
-                apps_to_process.append(app)
+        apps_to_process = [app for app in APPLICATIONS if app["package"] in installed_packages]
         logger.info(f"Found {len(apps_to_process)} installed applications")
     elif choice == 'n':
         numbers = input("Enter application numbers to process (comma-separated): ").strip()
@@ -415,27 +559,31 @@ def main():
     
     logger.info(f"Will process {len(apps_to_process)} applications")
     
+    # Install everything missing before any scanning (apt-get holds the dpkg lock)
+    installed_packages = install_applications(apps_to_process, installed_packages)
+    installed_apps = []
     for app in apps_to_process:
-        app_name = app["name"]
-        
-        # Try to install the application (or confirm it's installed)
-        if not install_application(app):
-            logger.warning(f"Skipping SBOM generation for {app_name} due to installation failure")
+        if app["package"] not in installed_packages:
+            logger.warning(f"Skipping SBOM generation for {app['name']} due to installation failure")
             skipped_apps += 1
             continue
-        
-        # Generate SBOM
-        sbom_filename, sbom_path = generate_sbom(app)
-        if sbom_filename and sbom_path:
-            # Backup the SBOM
-            if backup_sbom(sbom_filename, sbom_path):
+        installed_apps.append(app)
+    
+    sbom_cache = load_sbom_cache()
+    
+    # Each app's scan and backups are independent, so they run concurrently
+    with ThreadPoolExecutor(max_workers=SBOM_WORKERS) as pool:
+        futures = [
+            pool.submit(generate_and_backup_sbom, app, installed_packages.get(app["package"]), sbom_cache)
+            for app in installed_apps
+        ]
+        for future in as_completed(futures):
+            if future.result():
                 successful_sboms += 1
             else:
-                logger.warning(f"Failed to backup SBOM for {app_name}")
                 failed_sboms += 1
-        else:
-            logger.warning(f"Failed to generate SBOM for {app_name}")
-            failed_sboms += 1
+    
+    save_sbom_cache(sbom_cache)
     
     # Summary
     logger.info("SBOM generation process completed")
@@ -446,7 +594,7 @@ def main():
     logger.info(f"  - SBOM Dataset directory: {os.path.abspath(DATASET_DIR)}")
     logger.info(f"  - SBOM Files directory: {os.path.abspath(SBOM_FILES_DIR)}")
     logger.info(f"  - Local backup directory: {os.path.abspath(LOCAL_BACKUP_DIR)}")
-    if os.path.exists(WINDOWS_DIR):
+    if WINDOWS_AVAILABLE:
         logger.info(f"  - Windows directory: {WINDOWS_DIR}")
 
 if __name__ == "__main__":
@@ -6,7 +6,15 @@ import shutil
 import logging
 import sys
 import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+# orjson builds and parses the indented SBOM documents far faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration
 DATASET_DIR = "./sbom_files/SBOM"
@@ -14,6 +22,18 @@ LOCAL_BACKUP_DIR = os.path.expanduser("~/local_sbom_backup")
 WINDOWS_DIR = "/mnt/c/Users/Gunty Snehajoyce/Documents/SBOM"  # WSL path to Windows location
 SBOM_FILES_DIR = "./sbom_files"
 LOG_FILE = "syft_sboms.log"
+# Run start time, formatted once: the filename date stamp and the template SBOM timestamp
+RUN_STARTED = datetime.now()
+TIMESTAMP = RUN_STARTED.strftime("%Y%m%d")
+RUN_STARTED_ISO = RUN_STARTED.isoformat()
+# Concurrent applications; the work is subprocess and file I/O, so threads are enough to overlap it
+SBOM_WORKERS = os.cpu_count() or 4
+
+# Value ranges and licenses for template SBOM components, drawn in bulk per SBOM
+VERSION_MAJORS = range(1, 21)
+VERSION_MINORS = range(0, 100)
+VERSION_PATCHES = range(0, 1000)
+TEMPLATE_LICENSES = ("MIT", "Apache-2.0", "GPL-3.0", "BSD-3-Clause", "Proprietary")
 
 # Setup logging
 logging.basicConfig(
@@ -37,12 +57,11 @@ except Exception as e:
     logger.warning(f"Could not create Windows directory: {e}")
 
 def run_command(command):
-    """Run a shell command and return the output"""
-    logger.info(f"Running command: {command}")
+    """Run a command given as an argument list and return the output"""
+    logger.info(f"Running command: {' '.join(command)}")
     try:
         result = subprocess.run(
             command, 
-            shell=True, 
             check=True, 
             stdout=subprocess.PIPE, 
             stderr=subprocess.PIPE,
@@ -57,20 +76,50 @@ def run_command(command):
 def check_syft_installed():
     """Check if Syft is installed"""
     logger.info("Checking if Syft is installed...")
-    result = subprocess.run(
-        ["which", "syft"], 
-        stdout=subprocess.PIPE, 
-        stderr=subprocess.PIPE,
-        universal_newlines=True
-    )
-    
-    if result.returncode != 0:
+    if shutil.which("syft") is None:
         logger.warning("Syft not found. Please install Syft first.")
         return False
     else:
         logger.info("Syft is already installed")
         return True
 
+def dumps_json(data):
+    """Serialize data as 2-space indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+def loads_json(data):
+    """Parse a JSON document from str or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def write_json(file_path, data):
+    """Write data as 2-space indented JSON"""
+    with open(file_path, 'wb') as f:
+        f.write(dumps_json(data))
+
+@lru_cache(maxsize=None)
+def list_system_binaries():
+    """Regular files (not symlinks) under /usr/bin and /usr/sbin, in find order; walked once per run"""
+    binaries = []
+    for directory in ("/usr/bin", "/usr/sbin"):
+        for root, _, files in os.walk(directory):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                if os.path.isfile(path) and not os.path.islink(path):
+                    binaries.append(path)
+    return tuple(binaries)
+
+@lru_cache(maxsize=None)
+def find_app_binary(name):
+    """Path of an installed executable for name: on PATH, else the first system binary starting with it"""
+    app_path = shutil.which(name)
+    if app_path:
+        return app_path
+    return next((path for path in list_system_binaries() if os.path.basename(path).startswith(name)), "")
+
 def generate_version():
     """Generate a random version string"""
     major = random.randint(1, 20)
@@ -78,6 +127,15 @@ def generate_version():
     patch = random.randint(0, 999)
     return f"{major}.{minor}.{patch}"
 
+def generate_versions(count):
+    """Generate count random version strings at once"""
+    return [
+        f"{major}.{minor}.{patch}"
+        for major, minor, patch in zip(random.choices(VERSION_MAJORS, k=count),
+                                       random.choices(VERSION_MINORS, k=count),
+                                       random.choices(VERSION_PATCHES, k=count))
+    ]
+
 def generate_sbom_for_app(app_info):
     """Generate SBOM for an application using Syft"""
     name = app_info["name"]
@@ -90,8 +148,7 @@ def generate_sbom_for_app(app_info):
     logger.info(f"Generating SBOM for {name} ({supplier}) on {os_name}")
     
     # Create filenames
-    timestamp = datetime.now().strftime("%Y%m%d")
-    sbom_filename = f"{name}_{os_name}_{timestamp}_sbom.json"
+    sbom_filename = f"{name}_{os_name}_{TIMESTAMP}_sbom.json"
     sbom_path = os.path.join(DATASET_DIR, sbom_filename)
     
     # Generate SBOM
@@ -100,29 +157,19 @@ def generate_sbom_for_app(app_info):
         # Since we don't have the actual app to scan, we'll use the specified app name and metadata
         
         # First try to find if a similar app is installed that we can scan
-        check_cmd = f"which {name} 2>/dev/null || find /usr/bin /usr/sbin -name '{name}*' -type f | head -1"
-        result = subprocess.run(
-            check_cmd, 
-            shell=True, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE,
-            universal_newlines=True
-        )
-        
-        app_path = result.stdout.strip()
+        app_path = find_app_binary(name)
         
         if app_path:
             # If something similar is found, scan it
             logger.info(f"Found similar application at {app_path}, using it as base")
-            cmd = f"syft scan {app_path} -o cyclonedx-json"
+            cmd = ["syft", "scan", app_path, "-o", "cyclonedx-json"]
             try:
+                # Raw bytes: orjson parses them without a UTF-8 decode into str first
                 result = subprocess.run(
                     cmd, 
-                    shell=True, 
                     check=True, 
                     stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE,
-                    universal_newlines=True
+                    stderr=subprocess.PIPE
                 )
                 sbom_data = result.stdout
             except subprocess.CalledProcessError as e:
@@ -133,8 +180,22 @@ def generate_sbom_for_app(app_info):
             logger.info(f"No similar application found, creating template for {name}")
             sbom_data = None
         
+        # Parse the scan output in memory; the SBOM is written once, after its metadata is updated
+        sbom_json = None
+        unique_licenses = None
+        if sbom_data:
+            try:
+                sbom_json = loads_json(sbom_data)
+            except json.JSONDecodeError as e:
+                logger.error(f"Error parsing SBOM JSON for {name}: {e}")
+                # Keep Syft's output as-is
+                with open(sbom_path, 'wb') as f:
+                    f.write(sbom_data)
+                logger.info(f"SBOM for {name} saved to {sbom_path}")
+                return sbom_filename, sbom_path, 0, 0
+        
         # If we couldn't generate a real SBOM, create a template
-        if not sbom_data:
+        if sbom_json is None:
             # Create a baseline CycloneDX SBOM
             sbom_json = {
                 "bomFormat": "CycloneDX",
@@ -142,7 +203,7 @@ def generate_sbom_for_app(app_info):
                 "version": 1,
                 "serialNumber": f"urn:uuid:{os.urandom(16).hex()}",
                 "metadata": {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": RUN_STARTED_ISO,
                     "tools": [
                         {
                             "vendor": "SBOM Finder",
@@ -165,117 +226,116 @@ def generate_sbom_for_app(app_info):
             
             # Add random components (dependencies)
             num_components = random.randint(5, 30)
-            for i in range(num_components):
-                component_name = f"dependency-{i}"
-                component_version = generate_version()
-                
-                # Random license
-                licenses = []
-                license_type = random.choice(["MIT", "Apache-2.0", "GPL-3.0", "BSD-3-Clause", "Proprietary"])
-                licenses.append({
-                    "license": {
-                        "id": license_type
-                    }
-                })
-                
-                # Add component
-                sbom_json["components"].append({
+            versions = generate_versions(num_components)
+            license_types = random.choices(TEMPLATE_LICENSES, k=num_components)
+            unique_licenses = set(license_types)
+            sbom_json["components"] = [
+                {
                     "type": "library",
-                    "name": component_name,
+                    "name": f"dependency-{i}",
                     "version": component_version,
-                    "licenses": licenses
-                })
-                
-            # Convert to string
-            sbom_data = json.dumps(sbom_json, indent=2)
+                    "licenses": [{"license": {"id": license_type}}]
+                }
+                for i, (component_version, license_type) in enumerate(zip(versions, license_types))
+            ]
         
-        # Save the SBOM to file
-        with open(sbom_path, 'w') as f:
-            f.write(sbom_data)
-            
-        logger.info(f"SBOM for {name} saved to {sbom_path}")
+        # Add metadata if not present
+        if "metadata" not in sbom_json:
+            sbom_json["metadata"] = {}
         
-        # Parse the SBOM to add additional metadata
-        try:
-            sbom_json = json.loads(sbom_data)
-            
-            # Add metadata if not present
-            if "metadata" not in sbom_json:
-                sbom_json["metadata"] = {}
-            
-            # Add component metadata if not present
-            if "component" not in sbom_json["metadata"]:
-                sbom_json["metadata"]["component"] = {}
-            
-            # Update component metadata
-            component = sbom_json["metadata"]["component"]
-            component["name"] = name
-            component["type"] = "application"
-            component["version"] = version
-            
-            # Add supplier
-            if "supplier" not in component:
-                component["supplier"] = {"name": supplier}
+        # Add component metadata if not present
+        if "component" not in sbom_json["metadata"]:
+            sbom_json["metadata"]["component"] = {}
+        
+        # Update component metadata
+        component = sbom_json["metadata"]["component"]
+        component["name"] = name
+        component["type"] = "application"
+        component["version"] = version
+        
+        # Add supplier
+        if "supplier" not in component:
+            component["supplier"] = {"name": supplier}
+        else:
+            component["supplier"]["name"] = supplier
+        
+        # Add properties if not present
+        if "properties" not in component:
+            component["properties"] = []
+        
+        # Index existing properties by name (first occurrence wins, as the old scan did)
+        properties = component["properties"]
+        properties_by_name = {}
+        for prop in properties:
+            properties_by_name.setdefault(prop.get("name"), prop)
+        
+        # Function to add or update a property
+        def add_or_update_property(name, value):
+            prop = properties_by_name.get(name)
+            if prop is not None:
+                prop["value"] = value
             else:
-                component["supplier"]["name"] = supplier
-            
-            # Add properties if not present
-            if "properties" not in component:
-                component["properties"] = []
-            
-            # Function to add or update a property
-            def add_or_update_property(name, value):
-                for prop in component["properties"]:
-                    if prop.get("name") == name:
-                        prop["value"] = value
-                        return
-                component["properties"].append({"name": name, "value": value})
-            
-            add_or_update_property("category", category)
-            add_or_update_property("os", os_name)
-            add_or_update_property("type", app_type)
-            
-            # Count components
-            components_count = len(sbom_json.get("components", []))
-            
-            # Count unique licenses
-            unique_licenses = set()
-            for comp in sbom_json.get("components", []):
-                if "licenses" in comp:
-                    for lic in comp["licenses"]:
-                        if isinstance(lic, dict) and "license" in lic and isinstance(lic["license"], dict):
-                            unique_licenses.add(lic["license"].get("id", "Unknown"))
-            
-            # Add counts to metadata
-            add_or_update_property("total_components", str(components_count))
-            add_or_update_property("unique_licenses", str(len(unique_licenses)))
-            
-            # Save updated SBOM
-            with open(sbom_path, 'w') as f:
-                json.dump(sbom_json, f, indent=2)
-            
-            logger.info(f"Updated SBOM metadata for {name}")
-            
-            return sbom_filename, sbom_path, components_count, len(unique_licenses)
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Error parsing SBOM JSON for {name}: {e}")
-            return sbom_filename, sbom_path, 0, 0
+                prop = {"name": name, "value": value}
+                properties.append(prop)
+                properties_by_name[name] = prop
+        
+        add_or_update_property("category", category)
+        add_or_update_property("os", os_name)
+        add_or_update_property("type", app_type)
+        
+        # Count components
+        components_count = len(sbom_json.get("components", []))
+        
+        # Count unique licenses (already known for a template)
+        if unique_licenses is None:
+            unique_licenses = {
+                lic["license"].get("id", "Unknown")
+                for comp in sbom_json.get("components", [])
+                for lic in comp.get("licenses") or ()
+                if isinstance(lic, dict) and isinstance(lic.get("license"), dict)
+            }
+        
+        # Add counts to metadata
+        add_or_update_property("total_components", str(components_count))
+        add_or_update_property("unique_licenses", str(len(unique_licenses)))
+        
+        # Save the SBOM to file
+        write_json(sbom_path, sbom_json)
+        
+        logger.info(f"SBOM for {name} saved to {sbom_path} with updated metadata")
+        
+        return sbom_filename, sbom_path, components_count, len(unique_licenses)
             
     except Exception as e:
         logger.error(f"Failed to generate SBOM for {name}: {e}")
         return None, None, 0, 0
 
+def write_backup(source_path, target_path, data):
+    """Write source_path's bytes (data) to target_path, replacing any existing file, with copy2's metadata"""
+    fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    # Keep the source mtime and permissions, as shutil.copy2 did
+    shutil.copystat(source_path, target_path)
+
 def backup_sbom(filename, source_path):
     """Backup an SBOM file to multiple locations"""
-    if not os.path.exists(source_path):
+    # Read the SBOM once and write those bytes to every backup location
+    try:
+        with open(source_path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
         logger.error(f"Source file not found: {source_path}")
         return False
     
     # Copy to sbom_files directory
     sbom_files_path = os.path.join(SBOM_FILES_DIR, filename)
     try:
-        shutil.copy2(source_path, sbom_files_path)
+        write_backup(source_path, sbom_files_path, data)
         logger.info(f"Backed up SBOM to {sbom_files_path}")
     except Exception as e:
         logger.error(f"Failed to backup to sbom_files: {e}")
@@ -283,7 +343,7 @@ def backup_sbom(filename, source_path):
     # Copy to local backup directory
     local_backup_path = os.path.join(LOCAL_BACKUP_DIR, filename)
     try:
-        shutil.copy2(source_path, local_backup_path)
+        write_backup(source_path, local_backup_path, data)
         logger.info(f"Backed up SBOM to {local_backup_path}")
     except Exception as e:
         logger.error(f"Failed to backup to local directory: {e}")
@@ -292,13 +352,43 @@ def backup_sbom(filename, source_path):
     if os.path.exists(WINDOWS_DIR):
         windows_backup_path = os.path.join(WINDOWS_DIR, filename)
         try:
-            shutil.copy2(source_path, windows_backup_path)
+            write_backup(source_path, windows_backup_path, data)
             logger.info(f"Backed up SBOM to Windows directory: {windows_backup_path}")
         except Exception as e:
             logger.error(f"Failed to backup to Windows directory: {e}")
     
     return True
 
+def process_app(app_info):
+    """Generate and back up one application's SBOM, returning its database entry or None on failure"""
+    name = app_info["name"]
+    os_name = app_info["os"]
+    
+    # Generate SBOM
+    sbom_filename, sbom_path, components_count, unique_licenses = generate_sbom_for_app(app_info)
+    
+    if not (sbom_filename and sbom_path):
+        logger.warning(f"Failed to generate SBOM for {name}")
+        return None
+    
+    # Backup the SBOM
+    if not backup_sbom(sbom_filename, sbom_path):
+        logger.warning(f"Failed to backup SBOM for {name}")
+        return None
+    
+    return {
+        "filename": sbom_filename,
+        "app_name": name,
+        "category": app_info["category"],
+        "operating_system": os_name,
+        "app_binary_type": app_info.get("type", "desktop"),
+        "supplier": app_info["supplier"],
+        "manufacturer": app_info["supplier"],
+        "version": app_info.get("version", "1.0.0"),
+        "total_components": components_count,
+        "unique_licenses": unique_licenses
+    }
+
 def main():
     """Main function to generate SBOMs for popular applications"""
     logger.info("Starting SBOM generation process using Syft")
@@ -473,38 +563,14 @@ def main():
         
     logger.info(f"Will process {len(apps_to_process)} applications")
     
-    # Process each application
-    for app_info in apps_to_process:
-        name = app_info["name"]
-        os_name = app_info["os"]
-        
-        # Generate SBOM
-        sbom_filename, sbom_path, components_count, unique_licenses = generate_sbom_for_app(app_info)
-        
-        if sbom_filename and sbom_path:
-            # Backup the SBOM
-            if backup_sbom(sbom_filename, sbom_path):
+    # Applications are independent, so they are processed concurrently; map keeps entries in selection order
+    with ThreadPoolExecutor(max_workers=SBOM_WORKERS) as pool:
+        for db_entry in pool.map(process_app, apps_to_process):
+            if db_entry:
                 successful_sboms += 1
-                
-                # Add to database entries
-                db_entries.append({
-                    "filename": sbom_filename,
-                    "app_name": name,
-                    "category": app_info["category"],
-                    "operating_system": os_name,
-                    "app_binary_type": app_info.get("type", "desktop"),
-                    "supplier": app_info["supplier"],
-                    "manufacturer": app_info["supplier"],
-                    "version": app_info.get("version", "1.0.0"),
-                    "total_components": components_count,
-                    "unique_licenses": unique_licenses
-                })
+                db_entries.append(db_entry)
             else:
-                logger.warning(f"Failed to backup SBOM for {name}")
                 failed_sboms += 1
-        else:
-            logger.warning(f"Failed to generate SBOM for {name}")
-            failed_sboms += 1
     
     # Summary
     logger.info("SBOM generation process completed")
@@ -520,8 +586,7 @@ def main():
     # Save database entries to a JSON file for later import
     if db_entries:
         db_json_path = "sbom_db_entries.json"
-        with open(db_json_path, "w") as f:
-            json.dump(db_entries, f, indent=2)
+        write_json(db_json_path, db_entries)
         logger.info(f"Saved {len(db_entries)} database entries to {db_json_path}")
         logger.info("To import these entries to the database, run: python3 import_sboms.py")
 
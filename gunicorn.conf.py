@@ -0,0 +1,25 @@
+"""Gunicorn settings for the SBOM Finder backend (picked up automatically from the working directory)"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = True
+
+def on_starting(server):
+    from app import ensure_db_initialized
+    # Create the schema once in the master; workers inherit the flag and skip it
+    ensure_db_initialized()
+
+def post_fork(server, worker):
+    from app import app, db, start_stats_refresher
+    # Drop SQLite connections inherited from the master without closing them under it
+    with app.app_context():
+        db.engine.dispose(close=False)
+    # Every worker starts a refresher thread, but only the one holding the refresher lock
+    # runs; the rest wait on it and take over if that worker exits
+    start_stats_refresher()
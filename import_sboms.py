@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import os
 import json
-import glob
 import sqlite3
 import logging
 import sys
@@ -65,6 +64,15 @@ def ensure_db_exists():
     
     conn.close()
 
+def list_json_files(directory):
+    """Paths of the regular *.json files in a directory, from a single directory scan"""
+    with os.scandir(directory) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.endswith(".json") and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
+
 def extract_sbom_metadata(sbom_path):
     """Extract metadata from SBOM file"""
     try:
@@ -253,16 +261,17 @@ def main():
     
     # DATASET_DIR
     if os.path.exists(DATASET_DIR):
-        dataset_sboms = glob.glob(os.path.join(DATASET_DIR, "*.json"))
+        dataset_sboms = list_json_files(DATASET_DIR)
         sbom_files.extend(dataset_sboms)
         logger.info(f"Found {len(dataset_sboms)} SBOM files in {DATASET_DIR}")
     
     # SBOM_FILES_DIR
     if os.path.exists(SBOM_FILES_DIR):
-        sbom_dir_files = glob.glob(os.path.join(SBOM_FILES_DIR, "*.json"))
+        sbom_dir_files = list_json_files(SBOM_FILES_DIR)
         
         # Only add files not already in the list
-        new_files = [f for f in sbom_dir_files if os.path.basename(f) not in [os.path.basename(x) for x in sbom_files]]
+        seen_names = {os.path.basename(path) for path in sbom_files}
+        new_files = [f for f in sbom_dir_files if os.path.basename(f) not in seen_names]
         sbom_files.extend(new_files)
         logger.info(f"Found {len(new_files)} additional SBOM files in {SBOM_FILES_DIR}")
     
@@ -0,0 +1,152 @@
+"""SBOM parsing shared by the web app and its indexing worker processes
+
+Imports nothing from Flask or the database, so spawned workers can load it cheaply.
+"""
+import json
+
+# Prefer orjson for SBOM parsing, fall back to the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Streaming parser for walking large SBOMs one component at a time
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+def json_loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def load_sbom_json(file_path):
+    """Read and parse an SBOM file as raw bytes"""
+    with open(file_path, 'rb') as f:
+        return json_loads(f.read())
+
+def extract_components_from_sbom(sbom_data):
+    """Extract components from SBOM based on format (CycloneDX, SPDX, etc.)"""
+    # Try CycloneDX format
+    if "components" in sbom_data:
+        return sbom_data.get("components", [])
+    
+    # Try SPDX format
+    if "packages" in sbom_data:
+        return sbom_data.get("packages", [])
+    
+    # Try Syft format
+    if "artifacts" in sbom_data:
+        return sbom_data.get("artifacts", [])
+    
+    # Default fallback
+    return []
+
+# Top-level keys holding the component list, in the order extract_components_from_sbom checks them
+SBOM_COMPONENT_KEYS = ("components", "packages", "artifacts")
+
+def iter_value_events(events, prefix):
+    """Yield the parse events of the JSON value at prefix, stopping where that value ends"""
+    depth = 0
+    for event in events:
+        yield event
+        if event[1] in ('start_map', 'start_array'):
+            depth += 1
+        elif event[1] in ('end_map', 'end_array'):
+            depth -= 1
+        if depth == 0:
+            return
+
+def iter_sbom_components(file_path):
+    """Stream components from an SBOM file in one pass without building the whole document"""
+    if ijson is None:
+        yield from extract_components_from_sbom(load_sbom_json(file_path))
+        return
+    
+    # Same format precedence as extract_components_from_sbom: a present key wins even when its
+    # list is empty. Components stream straight through; a lower-precedence list seen first is
+    # held until the end of the document shows no higher-precedence key follows it.
+    best_rank, held = len(SBOM_COMPONENT_KEYS), []
+    with open(file_path, 'rb') as f:
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            if prefix or event != 'map_key' or value not in SBOM_COMPONENT_KEYS:
+                continue
+            rank = SBOM_COMPONENT_KEYS.index(value)
+            if rank >= best_rank:
+                continue
+            items = ijson.items(iter_value_events(events, value), f"{value}.item")
+            if rank == 0:
+                yield from items
+                return
+            best_rank, held = rank, list(items)
+    yield from held
+
+def get_component_licenses(component):
+    """Extract license information from a component"""
+    licenses = []
+    
+    # Handle CycloneDX format
+    if "licenses" in component:
+        for lic in component.get("licenses", []):
+            if isinstance(lic, dict):
+                if "license" in lic and isinstance(lic["license"], dict):
+                    licenses.append(lic["license"].get("id", "Unknown"))
+                elif "expression" in lic:
+                    licenses.append(lic["expression"])
+    
+    # Handle SPDX format
+    if "licenseConcluded" in component and component["licenseConcluded"]:
+        licenses.append(component["licenseConcluded"])
+    
+    # Handle Syft format
+    if "licenseDeclared" in component and component["licenseDeclared"]:
+        licenses.append(component["licenseDeclared"])
+    
+    return licenses if licenses else ["Unknown"]
+
+def get_component_supplier(component):
+    """Extract the supplier name from a component"""
+    supplier = component.get("supplier") or component.get("publisher")
+    if isinstance(supplier, dict):
+        return supplier.get("name")
+    return supplier
+
+def process_sbom_file(file_path):
+    """Process SBOM file to count components and unique licenses, collecting its Artifact rows in the same pass"""
+    try:
+        # Stream components so only one is held in memory at a time
+        component_count = 0
+        unique_licenses = set()
+        artifact_rows = []
+        
+        for component in iter_sbom_components(file_path):
+            component_count += 1
+            name, version = component.get("name"), component.get("version")
+            supplier = get_component_supplier(component)
+            for license_info in get_component_licenses(component):
+                unique_licenses.add(license_info)
+                artifact_rows.append((name, version, license_info, supplier))
+        
+        return component_count, len(unique_licenses), artifact_rows
+    except Exception as e:
+        print(f"Error processing SBOM file {file_path}: {e}")
+        return 0, 0, []
+
+def collect_artifact_rows(file_path):
+    """Parse an SBOM into (name, version, license_id, supplier) tuples; safe to run in a worker process"""
+    try:
+        return [
+            (component.get("name"), component.get("version"),
+             license_info, get_component_supplier(component))
+            for component in iter_sbom_components(file_path)
+            for license_info in get_component_licenses(component)
+        ]
+    except Exception as e:
+        print(f"Error indexing artifacts for {file_path}: {e}")
+        return []
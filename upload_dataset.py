@@ -8,6 +8,10 @@ import re
 DATASET_DIR = os.path.join(os.getcwd(), "SBOM Dataset")
 UPLOAD_URL = "http://localhost:5001/api/upload"
 
+# Filename patterns, compiled once instead of on every call
+FILENAME_SEPARATOR_RE = re.compile(r'[-_]')
+VERSION_RE = re.compile(r'^v?\d+(\.\d+)*$')
+
 def extract_metadata_from_filename(filename):
     """
     Extract metadata from filename using patterns
@@ -17,7 +21,7 @@ def extract_metadata_from_filename(filename):
     - appname-os.json (chrome-android.json)
     """
     base_name = os.path.splitext(filename)[0]
-    parts = re.split(r'[-_]', base_name)
+    parts = FILENAME_SEPARATOR_RE.split(base_name)
     
     # Default values
     metadata = {
@@ -64,9 +68,8 @@ def extract_metadata_from_filename(filename):
                 break
     
     # Extract version (check for parts that start with v or contain numbers with dots)
-    version_pattern = re.compile(r'^v?\d+(\.\d+)*$')
     for part in parts:
-        if version_pattern.match(part):
+        if VERSION_RE.match(part):
             metadata["version"] = part
             break
     